@@ -4,22 +4,48 @@ HDR Meme Maker + Deep Fryer - Ferramenta de experimentação artística
 Cria imagens HDR reais e memes deep fried
 """
 
-import sys
 import os
-import subprocess
-import shutil
-import tempfile
-import io
-import numpy as np
-from PIL import Image, ImageEnhance, ImageFilter, ImageDraw
-from PIL.ImageQt import ImageQt
+import sys
+import time
+
+STARTUP_START = time.perf_counter()
+
+# Opções do modo filtro (meme_filter.main); o resto de argv fica para o Qt
+FILTER_OPTIONS = ("--preset", "--set", "--format", "--quality", "--speed", "--threads",
+                  "--seed", "--timing", "-h", "--help")
+
+
+def wants_filter(argv):
+    """Modo filtro só com uma opção dele (ou '-' = stdin) em argv; stdin em
+    pipe sozinho não basta (IDEs e supervisores abrem a GUI assim)"""
+    return any(arg == "-" or arg.split("=", 1)[0] in FILTER_OPTIONS for arg in argv)
+
+
+# Roda como filtro stdin -> stdout sem carregar Qt
+if __name__ == "__main__" and wants_filter(sys.argv[1:]):
+    import meme_filter
+    sys.exit(meme_filter.main())
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QSlider, QFileDialog, QMessageBox, QFrame,
-    QGroupBox, QGridLayout, QComboBox, QTabWidget, QCheckBox, QScrollArea
+    QGroupBox, QGridLayout, QComboBox, QTabWidget, QCheckBox, QScrollArea,
+    QSizePolicy, QSpinBox
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QFont, QPalette, QColor, QPixmap
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont, QPalette, QColor, QPixmap, QImage, QKeySequence, QShortcut
+
+# NumPy/Pillow e os módulos de efeitos/export (meme_effects, meme_export,
+# meme_history), meme_faces/meme_video (OpenCV) e meme_sweep
+# (multiprocessing) são importados só quando usados: nada disso é preciso
+# antes de carregar uma imagem
+import meme_governor
+import meme_params
+
+IMPORT_SECONDS = time.perf_counter() - STARTUP_START
+
+# HDR_MEME_PROFILE=1 imprime no stderr o tempo de cada fase do startup
+PROFILE_STARTUP = os.environ.get("HDR_MEME_PROFILE") == "1"
 
 COLORS = {
     "bg": "#0a0a0a",
@@ -34,63 +60,221 @@ COLORS = {
 
 MONO_FONT = "Monaco, Menlo, Consolas, monospace"
 
-EXIFTOOL_CONFIG = """
-%Image::ExifTool::UserDefined = (
-    'Image::ExifTool::Apple::Main' => {
-        0x0021 => {
-            Name => 'HDRGamma',
-            Writable => 'float',
-        },
-    },
-);
-1;
+SWEEP_STEPS = 5
+
+# Abas de sliders: (título, comentário, cor do comentário, [(chave, rótulo)])
+# Faixas de cada slider em meme_params.SLIDER_RANGES
+# Só a primeira é construída no startup; as outras na primeira vez que abrem
+SLIDER_TABS = [
+    ("BASIC", None, None, [
+        ("saturation", "SATURATION"),
+        ("contrast", "CONTRAST"),
+        ("brightness", "BRIGHTNESS"),
+        ("sharpness", "SHARPNESS"),
+        ("vibrance", "VIBRANCE"),
+    ]),
+    ("HDR", "// Apple HDRGamma EXIF tag", "text_dim", [
+        ("hdr_gamma", "HDR GAMMA"),
+        ("highlights", "HIGHLIGHTS"),
+        ("shadows", "SHADOWS"),
+        ("bloom", "BLOOM"),
+    ]),
+    ("DEEP FRY", "// Deep fried meme effects", "orange", [
+        ("fry_intensity", "FRY LEVEL"),
+        ("jpeg_quality", "JPEG CRUNCH"),
+        ("noise", "NOISE/GRAIN"),
+        ("posterize", "POSTERIZE"),
+        ("color_shift", "COLOR SHIFT"),
+    ]),
+    ("DISTORT", "// Glitch & distortion", "danger", [
+        ("chromatic", "CHROMATIC ABR"),
+        ("scanlines", "SCANLINES"),
+        ("pixelate", "PIXELATE"),
+        ("vhs", "VHS EFFECT"),
+        ("glitch", "GLITCH"),
+        ("datamosh", "DATAMOSH"),
+        ("quant_tamper", "QUANT TAMPER"),
+        ("mcu_shuffle", "MCU SHUFFLE"),
+    ]),
+]
+
+# Checkboxes por aba: (chave, rótulo)
+TAB_CHECKS = {
+    "DEEP FRY": [("lens_flare", "LENS FLARE (eyes)"), ("bulge", "BULGE EFFECT")],
+}
+
+
+# Montados uma vez no import; Qt só re-polisha quando o texto muda
+STYLESHEET = f"""
+    QMainWindow {{ background-color: {COLORS['bg']}; }}
+    QWidget {{
+        background-color: {COLORS['bg']};
+        color: {COLORS['green']};
+        font-family: {MONO_FONT};
+    }}
+    QLabel {{ color: {COLORS['green']}; }}
+    QPushButton {{
+        background-color: {COLORS['bg']};
+        color: {COLORS['green']};
+        border: 1px solid {COLORS['green']};
+        padding: 6px 12px;
+        font-family: {MONO_FONT};
+        font-size: 11px;
+    }}
+    QPushButton:hover {{
+        background-color: {COLORS['green']};
+        color: {COLORS['bg']};
+    }}
+    QPushButton:disabled {{
+        border-color: {COLORS['green_dark']};
+        color: {COLORS['green_dark']};
+    }}
+    QSlider::groove:horizontal {{
+        height: 4px;
+        background: {COLORS['green_dark']};
+    }}
+    QSlider::handle:horizontal {{
+        background: {COLORS['green']};
+        width: 10px;
+        height: 10px;
+        margin: -3px 0;
+    }}
+    QSlider::sub-page:horizontal {{
+        background: {COLORS['green']};
+    }}
+    QGroupBox {{
+        border: 1px solid {COLORS['green_dark']};
+        margin-top: 10px;
+        padding-top: 6px;
+        font-size: 10px;
+    }}
+    QGroupBox::title {{
+        color: {COLORS['green']};
+        subcontrol-origin: margin;
+        left: 8px;
+        padding: 0 4px;
+    }}
+    QTabWidget::pane {{
+        border: 1px solid {COLORS['green_dark']};
+        background-color: {COLORS['bg']};
+    }}
+    QTabBar::tab {{
+        background-color: {COLORS['bg']};
+        color: {COLORS['green_dim']};
+        border: 1px solid {COLORS['green_dark']};
+        padding: 6px 12px;
+        margin-right: 2px;
+    }}
+    QTabBar::tab:selected {{
+        background-color: {COLORS['green_dark']};
+        color: {COLORS['green']};
+    }}
+    QCheckBox {{
+        color: {COLORS['green']};
+        font-size: 10px;
+    }}
+    QCheckBox::indicator {{
+        width: 12px;
+        height: 12px;
+        border: 1px solid {COLORS['green']};
+        background-color: {COLORS['bg']};
+    }}
+    QCheckBox::indicator:checked {{
+        background-color: {COLORS['green']};
+    }}
 """
 
-APPLE_MAKERNOTES_HEX = (
-    "4170706c6500004d4d002a000000080005000100030000000100050000"
-    "000200070001000000106170706c650000000000000000000003000300"
-    "01000000010000000004000a00010000004a0000000500050001000000"
-    "520000000000000000010000000100000001000000"
-)
+PREVIEW_PLACEHOLDER_STYLE = f"""
+    QLabel {{
+        background-color: {COLORS['bg']};
+        border: 1px solid {COLORS['green_dark']};
+        color: {COLORS['text_dim']};
+        font-family: {MONO_FONT};
+        font-size: 12px;
+    }}
+"""
+
+PREVIEW_IMAGE_STYLE = f"""
+    QLabel {{
+        background-color: {COLORS['bg']};
+        border: 1px solid {COLORS['green']};
+    }}
+"""
+
+
+
+def _log_style(color):
+    return f"""
+        color: {color}; font-size: 9px; padding: 4px;
+        background-color: {COLORS['bg_panel']};
+        border: 1px solid {COLORS['green_dark']};
+    """
+
+
+LOG_STYLES = {False: _log_style(COLORS['green']), True: _log_style(COLORS['danger'])}
 
 
 class ImagePreview(QLabel):
+    resized = pyqtSignal()
+
     def __init__(self, title=""):
         super().__init__()
         self.title = title
+        self.buffer = None
+        self.has_image = False
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setMinimumSize(380, 320)
+        # O pixmap não pode ditar o tamanho do label (ele é renderizado para caber)
+        self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
         self.set_placeholder()
 
     def set_placeholder(self):
+        self.has_image = False
         self.setText(f"[ {self.title} ]\n\n> awaiting input...")
-        self.setStyleSheet(f"""
-            QLabel {{
-                background-color: {COLORS['bg']};
-                border: 1px solid {COLORS['green_dark']};
-                color: {COLORS['text_dim']};
-                font-family: {MONO_FONT};
-                font-size: 12px;
-            }}
-        """)
+        self.setStyleSheet(PREVIEW_PLACEHOLDER_STYLE)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.resized.emit()
+
+    def fit_size(self, image_size):
+        """Tamanho em pixels físicos (device pixels) que a imagem ocupa no label"""
+        dpr = self.devicePixelRatioF()
+        area = self.contentsRect().size()
+        w, h = image_size
+        scale = min(area.width() * dpr / w, area.height() * dpr / h)
+        return max(1, int(w * scale)), max(1, int(h * scale))
+
+    def fits(self, image_size):
+        """A imagem cabe na área do label em pixels físicos, sem redimensionar?"""
+        dpr = self.devicePixelRatioF()
+        area = self.contentsRect().size()
+        w, h = image_size
+        return w <= round(area.width() * dpr) and h <= round(area.height() * dpr)
 
     def set_image(self, pil_image):
-        if pil_image.mode not in ("RGB", "RGBA"):
+        import numpy as np
+        from PIL import Image
+
+        if pil_image.mode != "RGB":
             pil_image = pil_image.convert("RGB")
-        qimage = ImageQt(pil_image)
+        # O pipeline já renderiza no tamanho exato; só imagens maiores que a
+        # área (ex. contact sheet) são reduzidas. Não recalcular fit_size sobre
+        # o render: o arredondamento pode dar 1 px a mais e um resize por tick
+        if not self.fits(pil_image.size):
+            pil_image = pil_image.resize(self.fit_size(pil_image.size), Image.Resampling.LANCZOS)
+
+        # QImage aponta para o buffer NumPy sem copiar; guardamos a referência
+        self.buffer = np.asarray(pil_image)
+        h, w = self.buffer.shape[:2]
+        qimage = QImage(self.buffer.data, w, h, self.buffer.strides[0], QImage.Format.Format_RGB888)
         pixmap = QPixmap.fromImage(qimage)
-        scaled = pixmap.scaled(
-            self.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self.setPixmap(scaled)
-        self.setStyleSheet(f"""
-            QLabel {{
-                background-color: {COLORS['bg']};
-                border: 1px solid {COLORS['green']};
-            }}
-        """)
+        pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        self.setPixmap(pixmap)
+
+        if not self.has_image:
+            self.has_image = True
+            self.setStyleSheet(PREVIEW_IMAGE_STYLE)
 
 
 class HDRMemeMaker(QMainWindow):
@@ -99,97 +283,39 @@ class HDRMemeMaker(QMainWindow):
         self.image_path = None
         self.original_image = None
         self.preview_image = None
-        self.exiftool_available = shutil.which('exiftool') is not None
+        self.animated = False
+        self.flare_points = None
+        # Definidos na primeira imagem carregada (init_image_pipeline)
+        self.encoder_speed = None
+        self.encoder_threads = None
+        self.history = None
+        self.governor = meme_governor.PreviewGovernor()
+        # Valores de parâmetros cujos widgets ainda não foram construídos
+        self.pending_params = dict(meme_params.DEFAULT_PARAMS)
+        self.sliders = {}
+        self.checks = {}
+        self.tab_pages = {}
+        self.startup = {}
+        self.log_error = None
 
         self.preview_timer = QTimer()
         self.preview_timer.setSingleShot(True)
         self.preview_timer.timeout.connect(self.update_preview)
 
+        self.resize_timer = QTimer()
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.timeout.connect(self.on_preview_resized)
+
+        start = time.perf_counter()
         self.init_ui()
+        self.startup["init_ui"] = time.perf_counter() - start
 
     def init_ui(self):
         self.setWindowTitle("HDR_MEME_MAKER // DEEP_FRYER")
         self.setMinimumSize(1200, 850)
         self.resize(1280, 900)
 
-        self.setStyleSheet(f"""
-            QMainWindow {{ background-color: {COLORS['bg']}; }}
-            QWidget {{
-                background-color: {COLORS['bg']};
-                color: {COLORS['green']};
-                font-family: {MONO_FONT};
-            }}
-            QLabel {{ color: {COLORS['green']}; }}
-            QPushButton {{
-                background-color: {COLORS['bg']};
-                color: {COLORS['green']};
-                border: 1px solid {COLORS['green']};
-                padding: 6px 12px;
-                font-family: {MONO_FONT};
-                font-size: 11px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['green']};
-                color: {COLORS['bg']};
-            }}
-            QPushButton:disabled {{
-                border-color: {COLORS['green_dark']};
-                color: {COLORS['green_dark']};
-            }}
-            QSlider::groove:horizontal {{
-                height: 4px;
-                background: {COLORS['green_dark']};
-            }}
-            QSlider::handle:horizontal {{
-                background: {COLORS['green']};
-                width: 10px;
-                height: 10px;
-                margin: -3px 0;
-            }}
-            QSlider::sub-page:horizontal {{
-                background: {COLORS['green']};
-            }}
-            QGroupBox {{
-                border: 1px solid {COLORS['green_dark']};
-                margin-top: 10px;
-                padding-top: 6px;
-                font-size: 10px;
-            }}
-            QGroupBox::title {{
-                color: {COLORS['green']};
-                subcontrol-origin: margin;
-                left: 8px;
-                padding: 0 4px;
-            }}
-            QTabWidget::pane {{
-                border: 1px solid {COLORS['green_dark']};
-                background-color: {COLORS['bg']};
-            }}
-            QTabBar::tab {{
-                background-color: {COLORS['bg']};
-                color: {COLORS['green_dim']};
-                border: 1px solid {COLORS['green_dark']};
-                padding: 6px 12px;
-                margin-right: 2px;
-            }}
-            QTabBar::tab:selected {{
-                background-color: {COLORS['green_dark']};
-                color: {COLORS['green']};
-            }}
-            QCheckBox {{
-                color: {COLORS['green']};
-                font-size: 10px;
-            }}
-            QCheckBox::indicator {{
-                width: 12px;
-                height: 12px;
-                border: 1px solid {COLORS['green']};
-                background-color: {COLORS['bg']};
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {COLORS['green']};
-            }}
-        """)
+        self.setStyleSheet(STYLESHEET)
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -231,106 +357,14 @@ class HDRMemeMaker(QMainWindow):
 
         controls_layout.addWidget(file_group)
 
-        # Tabs para diferentes modos
+        # Tabs para diferentes modos (páginas vazias, conteúdo sob demanda)
         self.tabs = QTabWidget()
-
-        # === TAB 1: BASIC ===
-        basic_tab = QWidget()
-        basic_layout = QVBoxLayout(basic_tab)
-        basic_layout.setSpacing(8)
-
-        self.sliders = {}
-
-        basic_sliders = [
-            ("saturation", "SATURATION", 0, 50, 10),
-            ("contrast", "CONTRAST", 0, 30, 10),
-            ("brightness", "BRIGHTNESS", 5, 20, 10),
-            ("sharpness", "SHARPNESS", 0, 50, 10),
-            ("vibrance", "VIBRANCE", 0, 30, 10),
-        ]
-
-        for key, label, min_v, max_v, default in basic_sliders:
-            self.create_slider(basic_layout, key, label, min_v, max_v, default)
-
-        basic_layout.addStretch()
-        self.tabs.addTab(basic_tab, "BASIC")
-
-        # === TAB 2: HDR ===
-        hdr_tab = QWidget()
-        hdr_layout = QVBoxLayout(hdr_tab)
-        hdr_layout.setSpacing(8)
-
-        hdr_info = QLabel("// Apple HDRGamma EXIF tag")
-        hdr_info.setStyleSheet(f"color: {COLORS['text_dim']}; font-size: 9px;")
-        hdr_layout.addWidget(hdr_info)
-
-        hdr_sliders = [
-            ("hdr_gamma", "HDR GAMMA", 0, 40, 0),
-            ("highlights", "HIGHLIGHTS", 0, 30, 10),
-            ("shadows", "SHADOWS", 0, 30, 10),
-            ("bloom", "BLOOM", 0, 20, 0),
-        ]
-
-        for key, label, min_v, max_v, default in hdr_sliders:
-            self.create_slider(hdr_layout, key, label, min_v, max_v, default)
-
-        hdr_layout.addStretch()
-        self.tabs.addTab(hdr_tab, "HDR")
-
-        # === TAB 3: DEEP FRY ===
-        fry_tab = QWidget()
-        fry_layout = QVBoxLayout(fry_tab)
-        fry_layout.setSpacing(8)
-
-        fry_info = QLabel("// Deep fried meme effects")
-        fry_info.setStyleSheet(f"color: {COLORS['orange']}; font-size: 9px;")
-        fry_layout.addWidget(fry_info)
-
-        fry_sliders = [
-            ("fry_intensity", "FRY LEVEL", 0, 30, 0),
-            ("jpeg_quality", "JPEG CRUNCH", 1, 100, 100),
-            ("noise", "NOISE/GRAIN", 0, 50, 0),
-            ("posterize", "POSTERIZE", 2, 32, 32),
-            ("color_shift", "COLOR SHIFT", 0, 30, 0),
-        ]
-
-        for key, label, min_v, max_v, default in fry_sliders:
-            self.create_slider(fry_layout, key, label, min_v, max_v, default)
-
-        # Checkboxes para efeitos
-        self.lens_flare_check = QCheckBox("LENS FLARE (eyes)")
-        self.lens_flare_check.stateChanged.connect(self.schedule_preview_update)
-        fry_layout.addWidget(self.lens_flare_check)
-
-        self.bulge_check = QCheckBox("BULGE EFFECT")
-        self.bulge_check.stateChanged.connect(self.schedule_preview_update)
-        fry_layout.addWidget(self.bulge_check)
-
-        fry_layout.addStretch()
-        self.tabs.addTab(fry_tab, "DEEP FRY")
-
-        # === TAB 4: DISTORT ===
-        distort_tab = QWidget()
-        distort_layout = QVBoxLayout(distort_tab)
-        distort_layout.setSpacing(8)
-
-        distort_info = QLabel("// Glitch & distortion")
-        distort_info.setStyleSheet(f"color: {COLORS['danger']}; font-size: 9px;")
-        distort_layout.addWidget(distort_info)
-
-        distort_sliders = [
-            ("chromatic", "CHROMATIC ABR", 0, 30, 0),
-            ("scanlines", "SCANLINES", 0, 20, 0),
-            ("pixelate", "PIXELATE", 1, 32, 1),
-            ("vhs", "VHS EFFECT", 0, 20, 0),
-            ("glitch", "GLITCH", 0, 20, 0),
-        ]
-
-        for key, label, min_v, max_v, default in distort_sliders:
-            self.create_slider(distort_layout, key, label, min_v, max_v, default)
-
-        distort_layout.addStretch()
-        self.tabs.addTab(distort_tab, "DISTORT")
+        for title, _, _, _ in SLIDER_TABS:
+            page = QWidget()
+            self.tab_pages[title] = page
+            self.tabs.addTab(page, title)
+        self.build_tab(0)
+        self.tabs.currentChanged.connect(self.build_tab)
 
         controls_layout.addWidget(self.tabs)
 
@@ -340,25 +374,89 @@ class HDRMemeMaker(QMainWindow):
         presets_layout.setSpacing(4)
 
         presets = [
-            ("RESET", self.preset_reset, COLORS['green']),
-            ("HDR GLOW", self.preset_hdr_glow, COLORS['green']),
-            ("LIGHT FRY", self.preset_light_fry, COLORS['orange']),
-            ("CRISPY", self.preset_crispy, COLORS['orange']),
-            ("NUCLEAR", self.preset_nuclear, COLORS['danger']),
-            ("CURSED", self.preset_cursed, COLORS['danger']),
+            ("RESET", COLORS['green']),
+            ("HDR GLOW", COLORS['green']),
+            ("LIGHT FRY", COLORS['orange']),
+            ("CRISPY", COLORS['orange']),
+            ("NUCLEAR", COLORS['danger']),
+            ("CURSED", COLORS['danger']),
         ]
 
-        for i, (name, callback, color) in enumerate(presets):
+        for i, (name, color) in enumerate(presets):
             btn = QPushButton(name)
             btn.setStyleSheet(f"""
                 QPushButton {{ border-color: {color}; color: {color}; font-size: 10px; padding: 4px; }}
                 QPushButton:hover {{ background-color: {color}; color: {COLORS['bg']}; }}
             """)
-            btn.clicked.connect(callback)
+            btn.clicked.connect(lambda _, name=name: self.apply_preset(name))
             presets_layout.addWidget(btn, i // 3, i % 3)
 
+        # Undo/redo: parâmetros + renders comprimidos do preview
+        self.undo_btn = QPushButton("< UNDO")
+        self.undo_btn.clicked.connect(self.undo)
+        self.undo_btn.setEnabled(False)
+        presets_layout.addWidget(self.undo_btn, 2, 0)
+
+        self.redo_btn = QPushButton("REDO >")
+        self.redo_btn.clicked.connect(self.redo)
+        self.redo_btn.setEnabled(False)
+        presets_layout.addWidget(self.redo_btn, 2, 1)
+
+        self.history_label = QLabel("")
+        self.history_label.setStyleSheet(f"color: {COLORS['text_dim']}; font-size: 9px;")
+        self.history_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        presets_layout.addWidget(self.history_label, 2, 2)
+
+        QShortcut(QKeySequence.StandardKey.Undo, self, activated=self.undo)
+        QShortcut(QKeySequence.StandardKey.Redo, self, activated=self.redo)
+
         controls_layout.addWidget(presets_group)
 
+        # Sweep: grade de variantes de dois parâmetros
+        sweep_group = QGroupBox("[ SWEEP ]")
+        sweep_layout = QHBoxLayout(sweep_group)
+        sweep_layout.setSpacing(4)
+
+        self.sweep_row_combo = QComboBox()
+        self.sweep_col_combo = QComboBox()
+        for key in meme_params.SWEEP_PARAMS:
+            self.sweep_row_combo.addItem(key.upper(), key)
+            self.sweep_col_combo.addItem(key.upper(), key)
+        self.sweep_row_combo.setCurrentIndex(self.sweep_row_combo.findData("fry_intensity"))
+        self.sweep_col_combo.setCurrentIndex(self.sweep_col_combo.findData("jpeg_quality"))
+        sweep_layout.addWidget(self.sweep_row_combo, 1)
+        sweep_layout.addWidget(self.sweep_col_combo, 1)
+
+        self.sweep_btn = QPushButton("SHEET")
+        self.sweep_btn.clicked.connect(self.render_sweep)
+        self.sweep_btn.setEnabled(False)
+        sweep_layout.addWidget(self.sweep_btn)
+
+        controls_layout.addWidget(sweep_group)
+
+        # Preview: latência alvo do governador durante arrastes
+        preview_group = QGroupBox("[ PREVIEW ]")
+        preview_settings_layout = QHBoxLayout(preview_group)
+        preview_settings_layout.setSpacing(4)
+
+        target_label = QLabel("TARGET:")
+        target_label.setStyleSheet(f"color: {COLORS['green']}; font-size: 10px;")
+        preview_settings_layout.addWidget(target_label)
+
+        self.target_spin = QSpinBox()
+        self.target_spin.setRange(16, 1000)
+        self.target_spin.setSuffix(" ms")
+        self.target_spin.setValue(self.governor.target_ms)
+        self.target_spin.valueChanged.connect(self.set_target_latency)
+        preview_settings_layout.addWidget(self.target_spin)
+
+        self.render_label = QLabel("")
+        self.render_label.setStyleSheet(f"color: {COLORS['text_dim']}; font-size: 9px;")
+        self.render_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        preview_settings_layout.addWidget(self.render_label, 1)
+
+        controls_layout.addWidget(preview_group)
+
         # Export
         export_layout = QHBoxLayout()
 
@@ -372,8 +470,20 @@ class HDRMemeMaker(QMainWindow):
         self.export_png_btn.setEnabled(False)
         export_layout.addWidget(self.export_png_btn)
 
+        self.export_anim_btn = QPushButton("EXPORT ANIM")
+        self.export_anim_btn.clicked.connect(self.save_animation)
+        self.export_anim_btn.setEnabled(False)
+        export_layout.addWidget(self.export_anim_btn)
+
         controls_layout.addLayout(export_layout)
 
+        # Formatos extras (plugins opcionais) e ajustes do encoder; a linha é
+        # montada na primeira imagem (build_export_controls), sem meme_export
+        # no startup
+        self.export_more_layout = QHBoxLayout()
+        self.export_more_layout.setSpacing(4)
+        controls_layout.addLayout(self.export_more_layout)
+
         # Log
         self.output_label = QLabel("")
         self.output_label.setStyleSheet(f"""
@@ -409,6 +519,7 @@ class HDRMemeMaker(QMainWindow):
         previews_layout.setSpacing(10)
         self.original_preview = ImagePreview("INPUT")
         self.output_preview = ImagePreview("OUTPUT")
+        self.output_preview.resized.connect(self.schedule_preview_resize)
         previews_layout.addWidget(self.original_preview)
         previews_layout.addWidget(self.output_preview)
         preview_layout.addLayout(previews_layout)
@@ -429,6 +540,34 @@ class HDRMemeMaker(QMainWindow):
 
         main_layout.addWidget(preview_widget, 1)
 
+    def build_tab(self, index):
+        """Constrói os sliders da aba na primeira vez que ela é mostrada"""
+        title, info, info_color, sliders = SLIDER_TABS[index]
+        page = self.tab_pages[title]
+        if page.layout() is not None:
+            return
+
+        layout = QVBoxLayout(page)
+        layout.setSpacing(8)
+
+        if info:
+            info_label = QLabel(info)
+            info_label.setStyleSheet(f"color: {COLORS[info_color]}; font-size: 9px;")
+            layout.addWidget(info_label)
+
+        for key, label in sliders:
+            min_v, max_v = meme_params.SLIDER_RANGES[key]
+            self.create_slider(layout, key, label, min_v, max_v, self.pending_params[key])
+
+        for key, label in TAB_CHECKS.get(title, []):
+            check = QCheckBox(label)
+            check.setChecked(self.pending_params[key])
+            check.stateChanged.connect(self.schedule_preview_update)
+            layout.addWidget(check)
+            self.checks[key] = check
+
+        layout.addStretch()
+
     def create_slider(self, parent_layout, key, label_text, min_val, max_val, default):
         container = QHBoxLayout()
         container.setSpacing(6)
@@ -454,395 +593,260 @@ class HDRMemeMaker(QMainWindow):
             self.schedule_preview_update()
 
         slider.valueChanged.connect(on_change)
+        slider.sliderReleased.connect(self.schedule_preview_update)
         self.sliders[key] = slider
         parent_layout.addLayout(container)
 
     def get_val(self, key):
-        if key in self.sliders:
-            return self.sliders[key].value()
-        return 0
+        return self.get_params()[key]
+
+    def report_startup(self):
+        """Tempo até a primeira janela, com a divisão por fase"""
+        total = time.perf_counter() - STARTUP_START
+        self.startup["show"] = total - sum(self.startup.values())
+        self.info_bar.setText(f"Ready in {total * 1000:.0f} ms // Load an image to start")
+        if PROFILE_STARTUP:
+            for phase, seconds in self.startup.items():
+                print(f"{phase:<14}{seconds * 1000:>8.1f} ms", file=sys.stderr)
+            print(f"{'first window':<14}{total * 1000:>8.1f} ms", file=sys.stderr)
+
+    def is_dragging(self):
+        return any(slider.isSliderDown() for slider in self.sliders.values())
 
     def schedule_preview_update(self):
-        self.preview_timer.start(80)
+        dragging = self.is_dragging()
+        # No arraste é throttle: reiniciar o timer a cada movimento adiaria o render
+        if dragging and self.preview_timer.isActive():
+            return
+        self.preview_timer.start(self.governor.debounce_ms(dragging))
+
+    def set_target_latency(self, ms):
+        self.governor.target_ms = ms
+
+    def set_encoder_speed(self, speed):
+        self.encoder_speed = speed
+
+    def set_encoder_threads(self, threads):
+        self.encoder_threads = threads or None
 
     def log(self, msg, error=False):
-        color = COLORS['danger'] if error else COLORS['green']
         self.output_label.setText(f"> {msg}")
-        self.output_label.setStyleSheet(f"""
-            color: {color}; font-size: 9px; padding: 4px;
-            background-color: {COLORS['bg_panel']};
-            border: 1px solid {COLORS['green_dark']};
-        """)
+        if error != self.log_error:
+            self.log_error = error
+            self.output_label.setStyleSheet(LOG_STYLES[error])
 
     def select_image(self):
         path, _ = QFileDialog.getOpenFileName(
             self, "Load Image", "",
-            "Images (*.png *.jpg *.jpeg *.bmp *.tiff *.webp *.heic);;All (*.*)"
+            "Images (*.png *.jpg *.jpeg *.bmp *.tiff *.webp *.heic *.avif *.gif);;"
+            "Video (*.mp4 *.mov *.avi *.mkv *.m4v *.webm);;All (*.*)"
         )
         if path:
+            from PIL import Image
+            import meme_export
+            import meme_video
+            self.init_image_pipeline()
+            meme_export.register_heif()
             self.image_path = path
-            self.original_image = Image.open(path).convert("RGB")
+            self.flare_points = None
+            self.animated = meme_video.is_animated(path)
+            if self.animated:
+                # Primeiro frame serve de preview; export processa todos
+                frame, _ = next(meme_video.iter_frames(path))
+                self.original_image = frame
+            else:
+                self.original_image = Image.open(path).convert("RGB")
 
-            # Preview reduzido
-            self.preview_image = self.original_image.copy()
-            max_size = 600
-            if max(self.preview_image.size) > max_size:
-                ratio = max_size / max(self.preview_image.size)
-                new_size = (int(self.preview_image.width * ratio),
-                           int(self.preview_image.height * ratio))
-                self.preview_image = self.preview_image.resize(new_size, Image.Resampling.LANCZOS)
+            self.preview_image = self.make_preview_source()
 
             self.file_label.setText(os.path.basename(path))
             self.file_label.setStyleSheet(f"color: {COLORS['green']}; font-size: 9px;")
             self.export_jpg_btn.setEnabled(True)
             self.export_png_btn.setEnabled(True)
+            self.export_fmt_btn.setEnabled(True)
+            self.sweep_btn.setEnabled(True)
+            self.export_anim_btn.setEnabled(self.animated)
 
             w, h = self.original_image.size
-            self.info_bar.setText(f"Loaded: {w}x{h} // {os.path.basename(path)}")
+            if self.animated:
+                n_frames, frame_ms = meme_video.probe(path)
+                self.info_bar.setText(
+                    f"Loaded: {w}x{h} // {n_frames} frames @ {1000.0 / frame_ms:.1f} fps"
+                    f" // {os.path.basename(path)}"
+                )
+            else:
+                self.info_bar.setText(f"Loaded: {w}x{h} // {os.path.basename(path)}")
 
+            # Renders do histórico são da imagem anterior; parâmetros continuam
+            self.history.clear_renders()
             self.original_preview.set_image(self.preview_image)
             self.update_preview()
             self.log(f"loaded: {os.path.basename(path)}")
 
-    def update_preview(self):
-        if not self.preview_image:
+    def init_image_pipeline(self):
+        """Histórico e controles de export, criados na primeira imagem carregada"""
+        if self.history is not None:
             return
-        try:
-            processed = self.apply_all_effects(self.preview_image.copy())
-            self.output_preview.set_image(processed)
-        except Exception as e:
-            self.log(f"error: {str(e)[:40]}", error=True)
-
-    def apply_all_effects(self, img):
-        """Aplica todos os efeitos na imagem"""
-
-        # === BASIC ===
-        # Saturation
-        sat = self.get_val("saturation") / 10.0
-        if sat != 1.0:
-            img = ImageEnhance.Color(img).enhance(sat)
-
-        # Contrast
-        con = self.get_val("contrast") / 10.0
-        if con != 1.0:
-            img = ImageEnhance.Contrast(img).enhance(con)
-
-        # Brightness
-        bri = self.get_val("brightness") / 10.0
-        if bri != 1.0:
-            img = ImageEnhance.Brightness(img).enhance(bri)
-
-        # Sharpness
-        shp = self.get_val("sharpness") / 10.0
-        if shp != 1.0:
-            img = ImageEnhance.Sharpness(img).enhance(shp)
-
-        # Vibrance (saturação seletiva)
-        vib = self.get_val("vibrance") / 10.0
-        if vib > 1.0:
-            img = self.apply_vibrance(img, vib)
-
-        # === HDR ===
-        # Highlights
-        highlights = self.get_val("highlights") / 10.0
-        if highlights != 1.0:
-            img = self.adjust_highlights(img, highlights)
-
-        # Shadows
-        shadows = self.get_val("shadows") / 10.0
-        if shadows != 1.0:
-            img = self.adjust_shadows(img, shadows)
-
-        # Bloom
-        bloom = self.get_val("bloom")
-        if bloom > 0:
-            img = self.apply_bloom(img, bloom / 20.0)
-
-        # === DEEP FRY ===
-        fry = self.get_val("fry_intensity")
-        if fry > 0:
-            img = self.deep_fry(img, fry / 10.0)
-
-        # JPEG crunch
-        jpeg_q = self.get_val("jpeg_quality")
-        if jpeg_q < 100:
-            img = self.jpeg_compress(img, jpeg_q)
-
-        # Noise
-        noise = self.get_val("noise")
-        if noise > 0:
-            img = self.add_noise(img, noise / 50.0)
-
-        # Posterize
-        posterize = self.get_val("posterize")
-        if posterize < 32:
-            img = self.posterize(img, posterize)
-
-        # Color shift
-        color_shift = self.get_val("color_shift")
-        if color_shift > 0:
-            img = self.shift_colors(img, color_shift / 30.0)
-
-        # === DISTORT ===
-        # Chromatic aberration
-        chromatic = self.get_val("chromatic")
-        if chromatic > 0:
-            img = self.chromatic_aberration(img, chromatic)
-
-        # Scanlines
-        scanlines = self.get_val("scanlines")
-        if scanlines > 0:
-            img = self.add_scanlines(img, scanlines / 20.0)
-
-        # Pixelate
-        pixelate = self.get_val("pixelate")
-        if pixelate > 1:
-            img = self.pixelate(img, pixelate)
-
-        # VHS
-        vhs = self.get_val("vhs")
-        if vhs > 0:
-            img = self.vhs_effect(img, vhs / 20.0)
-
-        # Glitch
-        glitch = self.get_val("glitch")
-        if glitch > 0:
-            img = self.glitch_effect(img, glitch)
-
-        # === EXTRAS ===
-        if self.lens_flare_check.isChecked():
-            img = self.add_lens_flare(img)
-
-        if self.bulge_check.isChecked():
-            img = self.bulge_effect(img)
-
-        return img
-
-    def apply_vibrance(self, img, amount):
-        """Aumenta saturação mais em cores menos saturadas"""
-        arr = np.array(img, dtype=np.float32)
-        gray = np.mean(arr, axis=2, keepdims=True)
-        saturation = np.std(arr, axis=2, keepdims=True) / 128.0
-        mask = 1.0 - np.clip(saturation, 0, 1)
-        arr = gray + (arr - gray) * (1 + mask * (amount - 1))
-        return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
-
-    def adjust_highlights(self, img, amount):
-        """Ajusta áreas claras"""
-        arr = np.array(img, dtype=np.float32)
-        luminance = 0.299 * arr[:,:,0] + 0.587 * arr[:,:,1] + 0.114 * arr[:,:,2]
-        mask = np.clip((luminance - 128) / 127, 0, 1)[:,:,np.newaxis]
-        arr = arr * (1 + mask * (amount - 1))
-        return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
-
-    def adjust_shadows(self, img, amount):
-        """Ajusta áreas escuras"""
-        arr = np.array(img, dtype=np.float32)
-        luminance = 0.299 * arr[:,:,0] + 0.587 * arr[:,:,1] + 0.114 * arr[:,:,2]
-        mask = np.clip((128 - luminance) / 128, 0, 1)[:,:,np.newaxis]
-        arr = arr + mask * (amount - 1) * 50
-        return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
-
-    def apply_bloom(self, img, amount):
-        """Adiciona bloom/glow em áreas claras"""
-        blurred = img.filter(ImageFilter.GaussianBlur(radius=10))
-        arr = np.array(img, dtype=np.float32)
-        blur_arr = np.array(blurred, dtype=np.float32)
-
-        luminance = np.max(blur_arr, axis=2, keepdims=True)
-        mask = np.clip((luminance - 180) / 75, 0, 1)
-
-        result = arr + blur_arr * mask * amount
-        return Image.fromarray(np.clip(result, 0, 255).astype(np.uint8))
-
-    def deep_fry(self, img, intensity):
-        """Efeito deep fry clássico"""
-        # Saturação extrema
-        img = ImageEnhance.Color(img).enhance(1 + intensity * 2)
-        # Contraste extremo
-        img = ImageEnhance.Contrast(img).enhance(1 + intensity * 1.5)
-        # Sharpness extremo
-        img = ImageEnhance.Sharpness(img).enhance(1 + intensity * 3)
-
-        # Shift para amarelo/laranja
-        arr = np.array(img, dtype=np.float32)
-        arr[:,:,0] = np.clip(arr[:,:,0] * (1 + intensity * 0.3), 0, 255)  # R
-        arr[:,:,1] = np.clip(arr[:,:,1] * (1 + intensity * 0.15), 0, 255)  # G
-        arr[:,:,2] = np.clip(arr[:,:,2] * (1 - intensity * 0.2), 0, 255)  # B
-
-        return Image.fromarray(arr.astype(np.uint8))
-
-    def jpeg_compress(self, img, quality):
-        """Compressão JPEG para criar artefatos"""
-        buffer = io.BytesIO()
-        img.save(buffer, format='JPEG', quality=int(quality))
-        buffer.seek(0)
-        return Image.open(buffer).convert("RGB")
-
-    def add_noise(self, img, amount):
-        """Adiciona ruído/grain"""
-        arr = np.array(img, dtype=np.float32)
-        noise = np.random.normal(0, amount * 50, arr.shape)
-        arr = arr + noise
-        return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
-
-    def posterize(self, img, levels):
-        """Reduz níveis de cor"""
-        arr = np.array(img)
-        factor = 256 // levels
-        arr = (arr // factor) * factor
-        return Image.fromarray(arr)
-
-    def shift_colors(self, img, amount):
-        """Desloca canais de cor"""
-        arr = np.array(img, dtype=np.float32)
-        # Rotação no espaço HSV simulado
-        arr[:,:,0] = np.clip(arr[:,:,0] + amount * 30, 0, 255)
-        arr[:,:,2] = np.clip(arr[:,:,2] - amount * 20, 0, 255)
-        return Image.fromarray(arr.astype(np.uint8))
-
-    def chromatic_aberration(self, img, amount):
-        """Aberração cromática"""
-        arr = np.array(img)
-        result = np.zeros_like(arr)
-        offset = int(amount)
-
-        # Desloca canais R e B
-        result[:, offset:, 0] = arr[:, :-offset, 0] if offset > 0 else arr[:,:,0]
-        result[:, :, 1] = arr[:, :, 1]
-        result[:, :-offset, 2] = arr[:, offset:, 2] if offset > 0 else arr[:,:,2]
-
-        return Image.fromarray(result)
-
-    def add_scanlines(self, img, intensity):
-        """Adiciona scanlines"""
-        arr = np.array(img, dtype=np.float32)
-        for y in range(0, arr.shape[0], 2):
-            arr[y, :, :] *= (1 - intensity * 0.5)
-        return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
-
-    def pixelate(self, img, size):
-        """Pixelização"""
-        w, h = img.size
-        small = img.resize((w // size, h // size), Image.Resampling.NEAREST)
-        return small.resize((w, h), Image.Resampling.NEAREST)
-
-    def vhs_effect(self, img, intensity):
-        """Efeito VHS"""
-        arr = np.array(img, dtype=np.float32)
-
-        # Blur horizontal
-        for i in range(int(intensity * 5)):
-            arr = np.roll(arr, 1, axis=1) * 0.1 + arr * 0.9
-
-        # Distorção de cor
-        arr[:,:,0] = np.clip(arr[:,:,0] * (1 + intensity * 0.1), 0, 255)
-        arr[:,:,2] = np.clip(arr[:,:,2] * (1 - intensity * 0.1), 0, 255)
-
-        return Image.fromarray(arr.astype(np.uint8))
-
-    def glitch_effect(self, img, intensity):
-        """Efeito glitch"""
-        arr = np.array(img)
-        h, w = arr.shape[:2]
-
-        for _ in range(int(intensity)):
-            y = np.random.randint(0, h - 10)
-            height = np.random.randint(1, 10)
-            offset = np.random.randint(-20, 20)
-
-            if 0 <= y + height < h:
-                arr[y:y+height, :, :] = np.roll(arr[y:y+height, :, :], offset, axis=1)
-
-        return Image.fromarray(arr)
-
-    def add_lens_flare(self, img):
-        """Adiciona lens flare simples"""
-        arr = np.array(img, dtype=np.float32)
-        h, w = arr.shape[:2]
-
-        # Encontra pontos brilhantes
-        gray = np.mean(arr, axis=2)
-        bright_points = np.where(gray > 200)
-
-        if len(bright_points[0]) > 0:
-            # Pega alguns pontos aleatórios
-            indices = np.random.choice(len(bright_points[0]), min(5, len(bright_points[0])), replace=False)
-
-            for idx in indices:
-                cy, cx = bright_points[0][idx], bright_points[1][idx]
-
-                # Cria flare
-                y, x = np.ogrid[:h, :w]
-                dist = np.sqrt((x - cx)**2 + (y - cy)**2)
-                flare = np.exp(-dist / 30) * 100
-
-                arr[:,:,0] = np.clip(arr[:,:,0] + flare, 0, 255)
-                arr[:,:,1] = np.clip(arr[:,:,1] + flare * 0.8, 0, 255)
-
-        return Image.fromarray(arr.astype(np.uint8))
-
-    def bulge_effect(self, img):
-        """Efeito bulge no centro"""
-        arr = np.array(img)
-        h, w = arr.shape[:2]
-        cx, cy = w // 2, h // 2
-
-        y, x = np.indices((h, w))
-        dx = x - cx
-        dy = y - cy
-        dist = np.sqrt(dx**2 + dy**2)
-
-        radius = min(w, h) // 3
-        mask = dist < radius
-
-        factor = 1 + 0.5 * (1 - dist / radius)
-        factor = np.where(mask, factor, 1)
+        import meme_history
+        self.history = meme_history.History()
+        self.build_export_controls()
+
+    def build_export_controls(self):
+        """Formatos extras (plugins opcionais) e ajustes do encoder"""
+        import meme_export
+        self.encoder_speed = meme_export.DEFAULT_SPEED
+
+        self.format_combo = QComboBox()
+        for fmt in meme_export.available_formats():
+            if fmt not in ('jpg', 'png'):
+                self.format_combo.addItem(fmt.upper(), fmt)
+        self.export_more_layout.addWidget(self.format_combo, 1)
+
+        # 0 = menor arquivo, 10 = encode mais rápido (PNG/WebP/HEIC/AVIF)
+        speed_label = QLabel("SPEED:")
+        speed_label.setStyleSheet(f"color: {COLORS['green']}; font-size: 10px;")
+        self.export_more_layout.addWidget(speed_label)
+
+        self.speed_spin = QSpinBox()
+        self.speed_spin.setRange(0, 10)
+        self.speed_spin.setValue(meme_export.DEFAULT_SPEED)
+        self.speed_spin.valueChanged.connect(self.set_encoder_speed)
+        self.export_more_layout.addWidget(self.speed_spin)
+
+        threads_label = QLabel("THREADS:")
+        threads_label.setStyleSheet(f"color: {COLORS['green']}; font-size: 10px;")
+        self.export_more_layout.addWidget(threads_label)
+
+        # 0 = automático (todos os núcleos); só HEIC/AVIF respeitam
+        self.threads_spin = QSpinBox()
+        self.threads_spin.setRange(0, os.cpu_count() or 1)
+        self.threads_spin.setSpecialValueText("AUTO")
+        self.threads_spin.setValue(self.encoder_threads or 0)
+        self.threads_spin.valueChanged.connect(self.set_encoder_threads)
+        self.export_more_layout.addWidget(self.threads_spin)
+
+        self.export_fmt_btn = QPushButton("EXPORT")
+        self.export_fmt_btn.clicked.connect(
+            lambda: self.save_image(self.format_combo.currentData())
+        )
+        self.export_more_layout.addWidget(self.export_fmt_btn)
 
-        new_x = (cx + dx / factor).astype(int)
-        new_y = (cy + dy / factor).astype(int)
+        # Sem plugins extras a linha fica só com os ajustes (valem para o PNG)
+        if self.format_combo.count() == 0:
+            self.format_combo.hide()
+            self.export_fmt_btn.hide()
 
-        new_x = np.clip(new_x, 0, w - 1)
-        new_y = np.clip(new_y, 0, h - 1)
+    def make_preview_source(self):
+        """Original redimensionado uma vez para o tamanho físico do preview"""
+        size = self.output_preview.fit_size(self.original_image.size)
+        # Custo do render muda com a imagem/tamanho: medições antigas não valem
+        self.governor.reset()
+        from PIL import Image
+        return self.original_image.resize(size, Image.Resampling.LANCZOS)
 
-        result = arr[new_y, new_x]
-        return Image.fromarray(result)
+    def schedule_preview_resize(self):
+        self.resize_timer.start(120)
 
-    def add_hdr_metadata(self, filepath, hdr_gamma):
-        """Adiciona metadados HDR"""
-        if not self.exiftool_available or hdr_gamma <= 0:
-            return False
+    def on_preview_resized(self):
+        if not self.original_image:
+            return
+        size = self.output_preview.fit_size(self.original_image.size)
+        if self.preview_image is not None and self.preview_image.size == size:
+            return
+        self.preview_image = self.make_preview_source()
+        self.original_preview.set_image(self.preview_image)
+        self.update_preview()
 
+    def update_preview(self):
+        if not self.preview_image:
+            return
+        # Durante arrastes o governador pode reduzir resolução e pular estágios
+        dragging = self.is_dragging()
+        governor = self.governor
+        level = governor.choose(dragging)
+        params = governor.draft_params(self.get_params(), level)
         try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.config', delete=False) as f:
-                f.write(EXIFTOOL_CONFIG)
-                config_path = f.name
-
-            makernotes_path = tempfile.mktemp(suffix='.bin')
-            with open(makernotes_path, 'wb') as f:
-                f.write(bytes.fromhex(APPLE_MAKERNOTES_HEX))
-
-            subprocess.run([
-                'exiftool', '-config', config_path, '-overwrite_original',
-                '-if', 'not $makernotes', f'-makernotes<={makernotes_path}', filepath
-            ], capture_output=True, timeout=30)
-
-            subprocess.run([
-                'exiftool', '-config', config_path, '-overwrite_original',
-                f'-Apple:HDRGamma={hdr_gamma}', filepath
-            ], capture_output=True, timeout=30)
+            start = time.perf_counter()
+            processed = self.apply_all_effects(governor.draft_source(self.preview_image, level).copy(),
+                                               params)
+            governor.record(level, time.perf_counter() - start)
+            self.output_preview.set_image(meme_governor.upscale(processed, self.preview_image.size))
+        except Exception as e:
+            self.log(f"error: {str(e)[:40]}", error=True)
+            return
+        self.render_label.setText(f"{governor.last_ms:.0f} ms // {governor.describe(level)}")
+        # Passos intermediários de um arraste não entram no histórico
+        if not dragging:
+            self.history.record(self.get_params(), processed)
+            self.update_history_ui()
+
+    def update_history_ui(self):
+        history = self.history
+        self.undo_btn.setEnabled(history.can_undo())
+        self.redo_btn.setEnabled(history.can_redo())
+        self.history_label.setText(
+            f"{history.index + 1}/{len(history)} // {history.nbytes / 1e6:.1f} MB"
+        )
 
-            os.unlink(config_path)
-            if os.path.exists(makernotes_path):
-                os.unlink(makernotes_path)
+    def set_params(self, params):
+        # Abas ainda não construídas guardam o valor para quando forem abertas
+        self.pending_params.update(params)
+        for key, slider in self.sliders.items():
+            slider.setValue(params[key])
+        for key, check in self.checks.items():
+            check.setChecked(params[key])
+        self.schedule_preview_update()
+
+    def restore_step(self, step):
+        """Aplica um passo do histórico; usa o render guardado se houver"""
+        if step is None:
+            return
+        self.set_params(step.params)
+        render = None
+        if self.preview_image is not None:
+            render = self.history.render(step, self.preview_image.size)
+        if render is not None:
+            # Os setValue acima agendaram um render que não é mais necessário
+            self.preview_timer.stop()
+            self.output_preview.set_image(render)
+        self.update_history_ui()
+
+    def undo(self):
+        if self.history is None:
+            return
+        self.restore_step(self.history.undo())
+        self.log(f"undo: step {self.history.index + 1}/{len(self.history)}")
 
-            return True
-        except:
-            return False
+    def redo(self):
+        if self.history is None:
+            return
+        self.restore_step(self.history.redo())
+        self.log(f"redo: step {self.history.index + 1}/{len(self.history)}")
+
+    def get_params(self):
+        params = dict(self.pending_params)
+        params.update((key, slider.value()) for key, slider in self.sliders.items())
+        params.update((key, check.isChecked()) for key, check in self.checks.items())
+        return params
+
+    def get_flare_points(self):
+        """Olhos detectados na imagem carregada (detecção roda uma vez por imagem)"""
+        if self.flare_points is None and self.preview_image is not None:
+            import meme_faces
+            self.flare_points = meme_faces.detect_flare_points(self.preview_image)
+        return self.flare_points
+
+    def apply_all_effects(self, img, params=None):
+        """Aplica todos os efeitos na imagem (padrão: parâmetros da GUI)"""
+        params = params or self.get_params()
+        flare_points = self.get_flare_points() if params["lens_flare"] else None
+        import meme_effects
+        return meme_effects.apply_all_effects(img, params, flare_points=flare_points)
 
     def save_image(self, format='jpg'):
         if not self.original_image:
             return
+        import meme_export
 
         try:
             self.log("processing...")
@@ -850,103 +854,119 @@ class HDRMemeMaker(QMainWindow):
 
             processed = self.apply_all_effects(self.original_image.copy())
 
-            ext = '.jpg' if format == 'jpg' else '.png'
+            ext, filter_str = meme_export.EXPORT_FORMATS[format]
             default_name = f"meme_{os.path.splitext(os.path.basename(self.image_path))[0]}{ext}"
 
-            filter_str = "JPEG (*.jpg)" if format == 'jpg' else "PNG (*.png)"
             save_path, _ = QFileDialog.getSaveFileName(self, "Export", default_name, filter_str)
 
             if save_path:
                 if format == 'jpg':
-                    processed.save(save_path, 'JPEG', quality=98, subsampling=0)
-
                     hdr_gamma = self.get_val("hdr_gamma") / 10.0
                     if hdr_gamma > 0:
-                        self.add_hdr_metadata(save_path, hdr_gamma)
-                        self.log(f"saved with HDRGamma={hdr_gamma}")
+                        data = meme_export.encode_jpeg(
+                            processed,
+                            gain_map=meme_export.compute_gain_map(processed),
+                            exif=meme_export.apple_hdr_exif(hdr_gamma),
+                        )
+                    else:
+                        data = meme_export.encode_jpeg(processed)
+                    with open(save_path, 'wb') as f:
+                        f.write(data)
+
+                    if hdr_gamma > 0:
+                        self.log(f"saved with HDRGamma={hdr_gamma} + gain map")
                     else:
                         self.log(f"saved: {os.path.basename(save_path)}")
                 else:
-                    processed.save(save_path, 'PNG')
-                    self.log(f"saved: {os.path.basename(save_path)}")
+                    data = meme_export.encode_image(
+                        processed, format,
+                        speed=self.encoder_speed, threads=self.encoder_threads
+                    )
+                    with open(save_path, 'wb') as f:
+                        f.write(data)
+                    self.log(f"saved: {os.path.basename(save_path)} ({len(data) // 1024} KB)")
 
                 QMessageBox.information(self, "Exported", f"Saved to:\n{save_path}")
 
         except Exception as e:
             self.log(f"error: {str(e)}", error=True)
 
+    def sweep_values(self, key):
+        """SWEEP_STEPS valores igualmente espaçados na faixa do slider"""
+        lo, hi = meme_params.SLIDER_RANGES[key]
+        return sorted({round(lo + (hi - lo) * i / (SWEEP_STEPS - 1)) for i in range(SWEEP_STEPS)})
+
+    def render_sweep(self):
+        if not self.preview_image:
+            return
+
+        row_key = self.sweep_row_combo.currentData()
+        col_key = self.sweep_col_combo.currentData()
+        axes = [(row_key, self.sweep_values(row_key))]
+        if col_key != row_key:
+            axes.append((col_key, self.sweep_values(col_key)))
+
+        try:
+            self.log("rendering sweep...")
+            QApplication.processEvents()
+
+            params = self.get_params()
+            flare_points = self.get_flare_points() if params["lens_flare"] else None
+            start = time.perf_counter()
+            import meme_sweep
+            results = meme_sweep.sweep(self.preview_image, params, axes, flare_points=flare_points)
+            sheet = meme_sweep.contact_sheet(results, axes)
+            elapsed = time.perf_counter() - start
+
+            self.output_preview.set_image(sheet)
+            self.log(f"sweep: {len(results)} variants in {elapsed:.1f}s")
+
+            default_name = f"sweep_{os.path.splitext(os.path.basename(self.image_path))[0]}.png"
+            save_path, _ = QFileDialog.getSaveFileName(self, "Save Contact Sheet", default_name, "PNG (*.png)")
+            if save_path:
+                sheet.save(save_path, 'PNG')
+                self.log(f"saved: {os.path.basename(save_path)}")
+
+        except Exception as e:
+            self.log(f"error: {str(e)}", error=True)
+
+    def save_animation(self):
+        if not self.image_path or not self.animated:
+            return
+
+        import meme_video
+
+        try:
+            src_ext = os.path.splitext(self.image_path)[1].lower()
+            ext = src_ext if src_ext in meme_video.ANIMATED_IMAGE_EXTS else '.mp4'
+            default_name = f"meme_{os.path.splitext(os.path.basename(self.image_path))[0]}{ext}"
+            save_path, _ = QFileDialog.getSaveFileName(
+                self, "Export Animation", default_name,
+                "Animation (*.gif *.webp *.mp4 *.mov *.avi *.mkv)"
+            )
+            if not save_path:
+                return
+
+            self.log("processing frames...")
+            QApplication.processEvents()
+
+            count, elapsed, fps = meme_video.render_animation(
+                self.image_path, save_path, self.get_params()
+            )
+            self.log(f"saved {count} frames in {elapsed:.1f}s ({fps:.1f} fps)")
+            QMessageBox.information(self, "Exported", f"Saved to:\n{save_path}")
+
+        except Exception as e:
+            self.log(f"error: {str(e)}", error=True)
+
     # === PRESETS ===
-    def preset_reset(self):
-        for key, slider in self.sliders.items():
-            if key == "brightness":
-                slider.setValue(10)
-            elif key == "jpeg_quality":
-                slider.setValue(100)
-            elif key == "posterize":
-                slider.setValue(32)
-            elif key == "pixelate":
-                slider.setValue(1)
-            else:
-                slider.setValue(slider.minimum() if key in ["fry_intensity", "noise", "chromatic", "glitch"] else 10)
-        self.lens_flare_check.setChecked(False)
-        self.bulge_check.setChecked(False)
-        self.log("preset: RESET")
-
-    def preset_hdr_glow(self):
-        self.preset_reset()
-        self.sliders["saturation"].setValue(18)
-        self.sliders["contrast"].setValue(14)
-        self.sliders["hdr_gamma"].setValue(25)
-        self.sliders["highlights"].setValue(18)
-        self.sliders["bloom"].setValue(8)
-        self.log("preset: HDR GLOW")
-
-    def preset_light_fry(self):
-        self.preset_reset()
-        self.sliders["saturation"].setValue(25)
-        self.sliders["contrast"].setValue(18)
-        self.sliders["sharpness"].setValue(25)
-        self.sliders["fry_intensity"].setValue(10)
-        self.sliders["jpeg_quality"].setValue(40)
-        self.log("preset: LIGHT FRY")
-
-    def preset_crispy(self):
-        self.preset_reset()
-        self.sliders["saturation"].setValue(35)
-        self.sliders["contrast"].setValue(22)
-        self.sliders["sharpness"].setValue(40)
-        self.sliders["fry_intensity"].setValue(20)
-        self.sliders["jpeg_quality"].setValue(15)
-        self.sliders["noise"].setValue(15)
-        self.log("preset: CRISPY")
-
-    def preset_nuclear(self):
-        self.preset_reset()
-        self.sliders["saturation"].setValue(45)
-        self.sliders["contrast"].setValue(28)
-        self.sliders["sharpness"].setValue(50)
-        self.sliders["fry_intensity"].setValue(30)
-        self.sliders["jpeg_quality"].setValue(5)
-        self.sliders["noise"].setValue(25)
-        self.sliders["hdr_gamma"].setValue(35)
-        self.lens_flare_check.setChecked(True)
-        self.log("preset: NUCLEAR")
-
-    def preset_cursed(self):
-        self.preset_reset()
-        self.sliders["saturation"].setValue(40)
-        self.sliders["contrast"].setValue(25)
-        self.sliders["fry_intensity"].setValue(25)
-        self.sliders["jpeg_quality"].setValue(8)
-        self.sliders["noise"].setValue(30)
-        self.sliders["posterize"].setValue(8)
-        self.sliders["chromatic"].setValue(15)
-        self.sliders["glitch"].setValue(10)
-        self.bulge_check.setChecked(True)
-        self.log("preset: CURSED")
+    def apply_preset(self, name):
+        self.set_params(meme_params.preset_params(name))
+        self.log(f"preset: {name}")
 
 
 def main():
+    start = time.perf_counter()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
 
@@ -955,8 +975,13 @@ def main():
     palette.setColor(QPalette.ColorRole.WindowText, QColor(0, 255, 0))
     app.setPalette(palette)
 
+    qapp_seconds = time.perf_counter() - start
+
     window = HDRMemeMaker()
+    window.startup = {"import": IMPORT_SECONDS, "qapplication": qapp_seconds, **window.startup}
     window.show()
+    # Roda depois do primeiro ciclo de eventos, com a janela já pintada
+    QTimer.singleShot(0, window.report_startup)
     sys.exit(app.exec())
 
 
@@ -0,0 +1,215 @@
+"""
+Corrupção do bitstream JPEG (datamosh)
+Codifica uma vez em memória, mexe nos bytes (dados de scan, tabelas de
+quantização, ordem dos intervalos de restart) e decodifica com fallback:
+um JPEG quebrado nunca derruba o preview nem o worker.
+"""
+
+import io
+import re
+import struct
+import time
+
+import numpy as np
+from PIL import Image, ImageFile
+
+CORRUPT_QUALITY = 75
+# MCUs por intervalo de restart: cada intervalo decodifica sozinho, então
+# o estrago de um byte trocado fica contido e os blocos podem ser embaralhados
+RESTART_BLOCKS = 4
+# Distância máxima (em intervalos) de uma troca de MCUs
+SHUFFLE_SPAN = 16
+
+MARKER_DQT = 0xDB
+MARKER_SOS = 0xDA
+EOI = b"\xff\xd9"
+RST_PATTERN = re.compile(rb"\xff[\xd0-\xd7]")
+
+
+def encode(img, quality=CORRUPT_QUALITY):
+    """JPEG baseline em memória com marcadores de restart"""
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=quality, restart_marker_blocks=RESTART_BLOCKS)
+    return buffer.getvalue()
+
+
+def _segments(data):
+    """Gera (marcador, início do payload, fim) dos segmentos até o SOS inclusive"""
+    pos = 2  # SOI
+    while pos + 4 <= len(data) and data[pos] == 0xFF:
+        marker = data[pos + 1]
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        yield marker, pos + 4, pos + 2 + length
+        if marker == MARKER_SOS:
+            return
+        pos += 2 + length
+
+
+def _split_scan(data):
+    """(cabeçalhos até o fim do SOS, dados de scan, EOI); None se não achar o scan"""
+    for marker, _, end in _segments(data):
+        if marker == MARKER_SOS:
+            eoi = data.rfind(EOI)
+            if eoi < end:
+                return None
+            return data[:end], data[end:eoi], data[eoi:]
+    return None
+
+
+def flip_scan_bytes(data, amount, rng):
+    """
+    Troca bits aleatórios nos dados de scan. Nunca toca em 0xFF nem no byte
+    seguinte (marcadores e byte stuffing), nem cria um 0xFF novo.
+    amount (0..1) é a fração de intervalos de restart atingidos.
+    """
+    parts = _split_scan(data)
+    if parts is None or not parts[1]:
+        return data
+    header, scan, tail = parts
+
+    arr = np.frombuffer(scan, np.uint8).copy()
+    intervals = len(RST_PATTERN.findall(scan)) + 1
+    count = max(1, round(amount * intervals))
+    pos = rng.integers(0, len(arr), count)
+    pos = pos[(arr[pos] != 0xFF) & (arr[np.maximum(pos - 1, 0)] != 0xFF)]
+    flipped = arr[pos] ^ (1 << rng.integers(0, 8, len(pos))).astype(np.uint8)
+    keep = flipped != 0xFF
+    arr[pos[keep]] = flipped[keep]
+    return header + arr.tobytes() + tail
+
+
+def tamper_quant_tables(data, amount, rng):
+    """
+    Escala coeficientes das tabelas de quantização (só no cabeçalho: o
+    decoder dequantiza com valores diferentes dos usados no encode).
+    amount (0..1) controla quantos coeficientes e o quanto mudam.
+    """
+    out = bytearray(data)
+    for marker, start, end in _segments(data):
+        if marker != MARKER_DQT:
+            continue
+        pos = start
+        while pos < end:
+            precision = out[pos] >> 4
+            size = 128 if precision else 64
+            if not precision:
+                table = np.frombuffer(bytes(out[pos + 1:pos + 65]), np.uint8).astype(np.float32)
+                count = max(1, round(amount * 64))
+                idx = rng.choice(64, count, replace=False)
+                table[idx] *= np.exp(rng.normal(0.0, 1.5 * amount, count))
+                out[pos + 1:pos + 65] = np.clip(table, 1, 255).astype(np.uint8).tobytes()
+            pos += 1 + size
+    return bytes(out)
+
+
+def shuffle_mcus(data, amount, rng):
+    """
+    Troca intervalos de restart de lugar (blocos de RESTART_BLOCKS MCUs) e
+    renumera os marcadores RST0..7, então o arquivo continua decodificável.
+    Sem marcadores de restart no arquivo, não há o que embaralhar.
+    """
+    parts = _split_scan(data)
+    if parts is None:
+        return data
+    header, scan, tail = parts
+
+    chunks = RST_PATTERN.split(scan)
+    n = len(chunks)
+    if n < 2:
+        return data
+    for _ in range(round(amount * n / 2)):
+        i = int(rng.integers(0, n))
+        j = min(max(i + int(rng.integers(-SHUFFLE_SPAN, SHUFFLE_SPAN + 1)), 0), n - 1)
+        chunks[i], chunks[j] = chunks[j], chunks[i]
+
+    out = bytearray(chunks[0])
+    for k, chunk in enumerate(chunks[1:]):
+        out += bytes((0xFF, 0xD0 + k % 8))
+        out += chunk
+    return header + bytes(out) + tail
+
+
+def safe_decode(data, fallback):
+    """
+    Decodifica o JPEG corrompido. Se o decoder desistir, tenta de novo
+    aceitando imagem truncada (o resto fica cinza, parte do visual);
+    se nem assim, ou se o tamanho mudar, devolve fallback.
+    """
+    for truncated in (False, True):
+        previous = ImageFile.LOAD_TRUNCATED_IMAGES
+        ImageFile.LOAD_TRUNCATED_IMAGES = truncated
+        try:
+            with Image.open(io.BytesIO(data)) as im:
+                img = im.convert("RGB")
+        # Bytes corrompidos podem quebrar o decoder de qualquer jeito
+        except Exception:
+            continue
+        finally:
+            ImageFile.LOAD_TRUNCATED_IMAGES = previous
+        if img.size == fallback.size:
+            return img
+    return fallback
+
+
+def corrupt(img, quant=0.0, shuffle=0.0, flip=0.0, rng=None):
+    """
+    Codifica uma vez, aplica nos mesmos bytes as operações com amount > 0
+    (tabelas de quantização -> troca de intervalos -> troca de bits) e
+    decodifica uma vez.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    # Uma sub-seed por operação, sempre sorteadas: ligar ou desligar uma
+    # não muda o resultado das outras
+    seeds = rng.integers(0, 2 ** 63, 3)
+    operations = (
+        (tamper_quant_tables, quant),
+        (shuffle_mcus, shuffle),
+        (flip_scan_bytes, flip),
+    )
+    if not any(amount > 0 for _, amount in operations):
+        return img
+
+    data = encode(img)
+    for (operation, amount), seed in zip(operations, seeds):
+        if amount > 0:
+            data = operation(data, amount, np.random.default_rng(seed))
+    return safe_decode(data, img)
+
+
+def datamosh(img, amount, rng=None):
+    return corrupt(img, flip=amount, rng=rng)
+
+
+def quant_tamper(img, amount, rng=None):
+    return corrupt(img, quant=amount, rng=rng)
+
+
+def mcu_shuffle(img, amount, rng=None):
+    return corrupt(img, shuffle=amount, rng=rng)
+
+
+def benchmark(img, repeat=5, seed=0):
+    """ms por chamada de cada efeito na imagem dada (melhor de N)"""
+    results = {}
+    def combined(img, amount, rng):
+        return corrupt(img, amount, amount, amount, rng)
+
+    for name, effect in (("datamosh", datamosh), ("quant_tamper", quant_tamper),
+                         ("mcu_shuffle", mcu_shuffle), ("combined", combined)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            effect(img, 0.5, rng=np.random.default_rng(seed))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best * 1000
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    img = Image.open(sys.argv[1]).convert("RGB")
+    print(f"{img.width}x{img.height}")
+    for name, ms in benchmark(img).items():
+        print(f"{name:<14}{ms:>9.1f} ms")
@@ -0,0 +1,304 @@
+"""
+Efeitos do HDR Meme Maker - funções puras (NumPy/Pillow)
+Sem dependência de Qt: usadas pela GUI e pelos workers de processamento
+"""
+
+import io
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+import meme_corrupt
+import meme_kernels
+from meme_params import DEFAULT_PARAMS
+
+# Além deste raio o flare (100 * e^(-d/30)) soma menos de 1 nível
+FLARE_RADIUS = 140
+
+# Quantos frames seguidos mantêm o mesmo padrão de glitch (coerência temporal)
+GLITCH_HOLD_FRAMES = 3
+
+
+# Ordem da cadeia de efeitos: (parâmetro, ativo para o valor?, efeito)
+EFFECT_STAGES = [
+    # === BASIC ===
+    ("saturation", lambda v: v != 10, lambda img, v, **_: ImageEnhance.Color(img).enhance(v / 10.0)),
+    ("contrast", lambda v: v != 10, lambda img, v, **_: ImageEnhance.Contrast(img).enhance(v / 10.0)),
+    ("brightness", lambda v: v != 10, lambda img, v, **_: ImageEnhance.Brightness(img).enhance(v / 10.0)),
+    ("sharpness", lambda v: v != 10, lambda img, v, **_: ImageEnhance.Sharpness(img).enhance(v / 10.0)),
+    ("vibrance", lambda v: v > 10, lambda img, v, **_: apply_vibrance(img, v / 10.0)),
+    # === HDR ===
+    ("highlights", lambda v: v != 10, lambda img, v, **_: adjust_highlights(img, v / 10.0)),
+    ("shadows", lambda v: v != 10, lambda img, v, **_: adjust_shadows(img, v / 10.0)),
+    ("bloom", lambda v: v > 0, lambda img, v, **_: apply_bloom(img, v / 20.0)),
+    # === DEEP FRY ===
+    ("fry_intensity", lambda v: v > 0, lambda img, v, **_: deep_fry(img, v / 10.0)),
+    ("jpeg_quality", lambda v: v < 100, lambda img, v, **_: jpeg_compress(img, v)),
+    ("noise", lambda v: v > 0, lambda img, v, rng, **_: add_noise(img, v / 50.0, rng=rng)),
+    ("posterize", lambda v: v < 32, lambda img, v, **_: posterize(img, v)),
+    ("color_shift", lambda v: v > 0, lambda img, v, **_: shift_colors(img, v / 30.0)),
+    # === DISTORT ===
+    ("chromatic", lambda v: v > 0, lambda img, v, **_: chromatic_aberration(img, v)),
+    ("scanlines", lambda v: v > 0, lambda img, v, **_: add_scanlines(img, v / 20.0)),
+    ("pixelate", lambda v: v > 1, lambda img, v, **_: pixelate(img, v)),
+    ("vhs", lambda v: v > 0, lambda img, v, **_: vhs_effect(img, v / 20.0)),
+    ("glitch", lambda v: v > 0, lambda img, v, rng, **_: glitch_effect(img, v, rng=rng)),
+    # === EXTRAS ===
+    ("lens_flare", bool, lambda img, v, rng, flare_points, **_: add_lens_flare(img, rng=rng, points=flare_points)),
+    ("bulge", bool, lambda img, v, **_: bulge_effect(img)),
+    # === CORRUPT === (no fim: não muda o índice/seed dos estágios anteriores)
+    # Um estágio só: um encode/decode para quant tamper + MCU shuffle + datamosh
+    ("corrupt", any, lambda img, v, rng, **_: meme_corrupt.corrupt(img, *(x / 20.0 for x in v), rng=rng)),
+]
+
+# Estágios que leem vários parâmetros: o valor é a tupla deles, nesta ordem
+STAGE_PARAMS = {
+    "corrupt": ("quant_tamper", "mcu_shuffle", "datamosh"),
+}
+
+STAGE_INDEX = {key: i for i, (key, _, _) in enumerate(EFFECT_STAGES)}
+STAGE_INDEX.update({
+    param: STAGE_INDEX[stage]
+    for stage, params in STAGE_PARAMS.items()
+    for param in params
+})
+
+# Ruído muda a cada frame; glitch e flare seguram GLITCH_HOLD_FRAMES frames
+PER_FRAME_STAGES = ("noise",)
+
+
+def stage_index(key):
+    """Posição do parâmetro na cadeia; parâmetros sem efeito nos pixels
+    (ex. hdr_gamma, só metadado) ficam depois do último estágio"""
+    return STAGE_INDEX.get(key, len(EFFECT_STAGES))
+
+
+def stage_rng(seed, frame_index, key):
+    """RNG determinístico por estágio e frame (aleatório se seed for None)"""
+    if seed is None:
+        return np.random.default_rng()
+    if key not in PER_FRAME_STAGES:
+        frame_index //= GLITCH_HOLD_FRAMES
+    return np.random.default_rng([seed, frame_index, STAGE_INDEX[key]])
+
+
+def apply_all_effects(img, params, seed=None, frame_index=0, flare_points=None,
+                      start=0, stop=None):
+    """
+    Aplica todos os efeitos na imagem.
+    start/stop limitam a faixa de EFFECT_STAGES executada, para reaproveitar
+    o resultado dos estágios anteriores (ex. sweep de parâmetros).
+    """
+    p = {**DEFAULT_PARAMS, **params}
+    stop = len(EFFECT_STAGES) if stop is None else stop
+
+    for key, active, effect in EFFECT_STAGES[start:stop]:
+        if key in STAGE_PARAMS:
+            value = tuple(p[param] for param in STAGE_PARAMS[key])
+        else:
+            value = p[key]
+        if active(value):
+            img = effect(img, value, rng=stage_rng(seed, frame_index, key),
+                         flare_points=flare_points)
+
+    return img
+
+
+def apply_vibrance(img, amount):
+    """Aumenta saturação mais em cores menos saturadas"""
+    return Image.fromarray(meme_kernels.vibrance(np.asarray(img), amount))
+
+
+def adjust_highlights(img, amount):
+    """Ajusta áreas claras"""
+    return Image.fromarray(meme_kernels.highlights(np.asarray(img), amount))
+
+
+def adjust_shadows(img, amount):
+    """Ajusta áreas escuras"""
+    return Image.fromarray(meme_kernels.shadows(np.asarray(img), amount))
+
+
+def apply_bloom(img, amount):
+    """Adiciona bloom/glow em áreas claras"""
+    blurred = img.filter(ImageFilter.GaussianBlur(radius=10))
+    result = meme_kernels.bloom(np.asarray(img), np.asarray(blurred), amount)
+    return Image.fromarray(result)
+
+
+def deep_fry(img, intensity):
+    """Efeito deep fry clássico"""
+    # Saturação extrema
+    img = ImageEnhance.Color(img).enhance(1 + intensity * 2)
+    # Contraste extremo
+    img = ImageEnhance.Contrast(img).enhance(1 + intensity * 1.5)
+    # Sharpness extremo
+    img = ImageEnhance.Sharpness(img).enhance(1 + intensity * 3)
+
+    # Shift para amarelo/laranja
+    arr = meme_kernels.channel_gains(
+        np.asarray(img),
+        1 + intensity * 0.3,   # R
+        1 + intensity * 0.15,  # G
+        1 - intensity * 0.2,   # B
+    )
+    return Image.fromarray(arr)
+
+
+def jpeg_compress(img, quality):
+    """Compressão JPEG para criar artefatos"""
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=int(quality))
+    buffer.seek(0)
+    return Image.open(buffer).convert("RGB")
+
+
+def add_noise(img, amount, rng=None):
+    """Adiciona ruído/grain"""
+    rng = rng if rng is not None else np.random.default_rng()
+    arr = np.array(img, dtype=np.float32)
+    noise = rng.normal(0, amount * 50, arr.shape)
+    arr = arr + noise
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+
+
+def posterize(img, levels):
+    """Reduz níveis de cor"""
+    arr = np.array(img)
+    factor = 256 // levels
+    arr = (arr // factor) * factor
+    return Image.fromarray(arr)
+
+
+def shift_colors(img, amount):
+    """Desloca canais de cor"""
+    arr = np.array(img, dtype=np.float32)
+    # Rotação no espaço HSV simulado
+    arr[:,:,0] = np.clip(arr[:,:,0] + amount * 30, 0, 255)
+    arr[:,:,2] = np.clip(arr[:,:,2] - amount * 20, 0, 255)
+    return Image.fromarray(arr.astype(np.uint8))
+
+
+def chromatic_aberration(img, amount):
+    """Aberração cromática"""
+    arr = np.array(img)
+    result = np.zeros_like(arr)
+    offset = int(amount)
+
+    # Desloca canais R e B
+    result[:, offset:, 0] = arr[:, :-offset, 0] if offset > 0 else arr[:,:,0]
+    result[:, :, 1] = arr[:, :, 1]
+    result[:, :-offset, 2] = arr[:, offset:, 2] if offset > 0 else arr[:,:,2]
+
+    return Image.fromarray(result)
+
+
+def add_scanlines(img, intensity):
+    """Adiciona scanlines"""
+    arr = np.array(img, dtype=np.float32)
+    for y in range(0, arr.shape[0], 2):
+        arr[y, :, :] *= (1 - intensity * 0.5)
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+
+
+def pixelate(img, size):
+    """Pixelização"""
+    w, h = img.size
+    small = img.resize((w // size, h // size), Image.Resampling.NEAREST)
+    return small.resize((w, h), Image.Resampling.NEAREST)
+
+
+def vhs_effect(img, intensity):
+    """Efeito VHS"""
+    arr = np.array(img, dtype=np.float32)
+
+    # Blur horizontal
+    for i in range(int(intensity * 5)):
+        arr = np.roll(arr, 1, axis=1) * 0.1 + arr * 0.9
+
+    # Distorção de cor
+    arr[:,:,0] = np.clip(arr[:,:,0] * (1 + intensity * 0.1), 0, 255)
+    arr[:,:,2] = np.clip(arr[:,:,2] * (1 - intensity * 0.1), 0, 255)
+
+    return Image.fromarray(arr.astype(np.uint8))
+
+
+def glitch_effect(img, intensity, rng=None):
+    """Efeito glitch"""
+    rng = rng if rng is not None else np.random.default_rng()
+    arr = np.array(img)
+    h, w = arr.shape[:2]
+
+    for _ in range(int(intensity)):
+        y = rng.integers(0, h - 10)
+        height = rng.integers(1, 10)
+        offset = rng.integers(-20, 20)
+
+        if 0 <= y + height < h:
+            arr[y:y+height, :, :] = np.roll(arr[y:y+height, :, :], offset, axis=1)
+
+    return Image.fromarray(arr)
+
+
+def add_lens_flare(img, rng=None, points=None):
+    """
+    Adiciona lens flare. Com points (x, y normalizados 0..1, ex. olhos
+    detectados), usa essas posições; senão sorteia pontos brilhantes.
+    """
+    arr = np.array(img, dtype=np.float32)
+    h, w = arr.shape[:2]
+
+    if points:
+        centers = [(int(y * (h - 1)), int(x * (w - 1))) for x, y in points]
+    else:
+        rng = rng if rng is not None else np.random.default_rng()
+
+        # Encontra pontos brilhantes
+        gray = np.mean(arr, axis=2)
+        bright_points = np.where(gray > 200)
+        centers = []
+
+        if len(bright_points[0]) > 0:
+            # Pega alguns pontos aleatórios
+            indices = rng.choice(len(bright_points[0]), min(5, len(bright_points[0])), replace=False)
+            centers = [(bright_points[0][idx], bright_points[1][idx]) for idx in indices]
+
+    for cy, cx in centers:
+        # Cria flare só na janela onde ele ainda soma >= 1 nível
+        y0, y1 = max(cy - FLARE_RADIUS, 0), min(cy + FLARE_RADIUS + 1, h)
+        x0, x1 = max(cx - FLARE_RADIUS, 0), min(cx + FLARE_RADIUS + 1, w)
+        y, x = np.ogrid[y0:y1, x0:x1]
+        dist = np.sqrt((x - cx)**2 + (y - cy)**2)
+        flare = np.exp(-dist / 30) * 100
+
+        window = arr[y0:y1, x0:x1]
+        window[:,:,0] = np.clip(window[:,:,0] + flare, 0, 255)
+        window[:,:,1] = np.clip(window[:,:,1] + flare * 0.8, 0, 255)
+
+    return Image.fromarray(arr.astype(np.uint8))
+
+
+def bulge_effect(img):
+    """Efeito bulge no centro"""
+    arr = np.array(img)
+    h, w = arr.shape[:2]
+    cx, cy = w // 2, h // 2
+
+    y, x = np.indices((h, w))
+    dx = x - cx
+    dy = y - cy
+    dist = np.sqrt(dx**2 + dy**2)
+
+    radius = min(w, h) // 3
+    mask = dist < radius
+
+    factor = 1 + 0.5 * (1 - dist / radius)
+    factor = np.where(mask, factor, 1)
+
+    new_x = (cx + dx / factor).astype(int)
+    new_y = (cy + dy / factor).astype(int)
+
+    new_x = np.clip(new_x, 0, w - 1)
+    new_y = np.clip(new_y, 0, h - 1)
+
+    result = arr[new_y, new_x]
+    return Image.fromarray(result)
@@ -0,0 +1,267 @@
+"""
+Exportação do HDR Meme Maker
+JPEG com gain map HDR da Apple embutido via MPF (Multi-Picture Format)
+"""
+
+import importlib.util
+import io
+import os
+import struct
+import time
+import numpy as np
+from PIL import Image, ImageFilter, features
+
+from meme_kernels import highlights_mask, bloom_mask
+
+# HEIC depende do plugin opcional pillow-heif; o import fica para
+# register_heif(), só quando HEIC é usado
+HEIF_AVAILABLE = importlib.util.find_spec("pillow_heif") is not None
+_heif_registered = False
+
+# Formato -> (extensão, filtro do diálogo de arquivo)
+EXPORT_FORMATS = {
+    'jpg': ('.jpg', "JPEG (*.jpg)"),
+    'png': ('.png', "PNG (*.png)"),
+    'webp': ('.webp', "WebP (*.webp)"),
+    'heic': ('.heic', "HEIC (*.heic)"),
+    'avif': ('.avif', "AVIF (*.avif)"),
+}
+
+# Velocidade do encoder: 0 = mais lento/menor arquivo, 10 = mais rápido
+DEFAULT_SPEED = 6
+DEFAULT_QUALITY = 90
+
+# Presets do x265 do mais lento ao mais rápido (HEIC)
+X265_PRESETS = [
+    "placebo", "veryslow", "slower", "slow", "medium",
+    "fast", "faster", "veryfast", "superfast", "ultrafast",
+]
+
+# Gain maps da Apple têm 1/4 da resolução da imagem principal em cada eixo
+GAIN_MAP_SCALE = 4
+GAIN_MAP_QUALITY = 85
+GAIN_MAP_GAMMA = 2.2
+BLOOM_REDUCE = 4
+
+GAIN_MAP_XMP = b"""<x:xmpmeta xmlns:x="adobe:ns:meta/">
+ <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+  <rdf:Description rdf:about=""
+    xmlns:HDRGainMap="http://ns.apple.com/HDRGainMap/1.0/"
+    xmlns:apdi="http://ns.apple.com/pixeldatainfo/1.0/"
+   HDRGainMap:HDRGainMapVersion="65536"
+   apdi:AuxiliaryImageType="urn:com:apple:photo:2020:aux:hdrgainmap"
+   apdi:StoredFormat="1278226488"
+   apdi:NativeFormat="1278226488"/>
+ </rdf:RDF>
+</x:xmpmeta>"""
+
+XMP_HEADER = b"http://ns.adobe.com/xap/1.0/\x00"
+
+# Curva de codificação do gain map (LUT evita np.power no mapa inteiro)
+_GAMMA_LUT = [round(255.0 * (v / 255.0) ** (1.0 / GAIN_MAP_GAMMA)) for v in range(256)]
+
+# Atributos do MP Entry (CIPA DC-007)
+MP_TYPE_PRIMARY = 0x20030000
+MP_TYPE_UNDEFINED = 0x00000000
+
+# Maker note da Apple: cabeçalho "Apple iOS", versão 1, big-endian
+APPLE_MAKERNOTE_HEADER = b"Apple iOS\x00\x00\x01MM"
+APPLE_MAKERNOTE_VERSION = 14
+TAG_EXIF_IFD = 0x8769
+TAG_MAKERNOTE = 0x927C
+TAG_APPLE_VERSION = 0x0001
+TAG_APPLE_HDR_GAMMA = 0x0021
+
+
+def register_heif():
+    """Registra o plugin HEIF no Pillow (uma vez); False se não instalado"""
+    global _heif_registered
+    if HEIF_AVAILABLE and not _heif_registered:
+        import pillow_heif
+        pillow_heif.register_heif_opener()
+        _heif_registered = True
+    return _heif_registered
+
+
+def compute_gain_map(img, scale=GAIN_MAP_SCALE):
+    """
+    Gain map em tons de cinza a partir da imagem processada.
+    Usa as mesmas máscaras de highlights e bloom dos efeitos, calculadas
+    direto na versão reduzida para não custar nada perto do encode.
+    """
+    w, h = img.size
+    small = img.reduce(scale) if min(w, h) >= scale * 8 else img
+    arr = np.asarray(small, dtype=np.float32)
+
+    # Bloom é de baixa frequência: borra numa versão ainda menor e amplia
+    blurred = small.reduce(BLOOM_REDUCE).filter(
+        ImageFilter.GaussianBlur(radius=10 / (scale * BLOOM_REDUCE))
+    ).resize(small.size, Image.Resampling.BILINEAR)
+    blur_arr = np.asarray(blurred, dtype=np.float32)
+
+    gain = np.maximum(highlights_mask(arr), bloom_mask(blur_arr))
+    gain = (gain * 255.0).astype(np.uint8)
+    return Image.fromarray(gain).point(_GAMMA_LUT)
+
+
+def _segments_end(data):
+    """Posição logo após os segmentos APPn iniciais (onde inserir novos)"""
+    pos = 2  # SOI
+    while pos + 4 <= len(data) and data[pos] == 0xFF and 0xE0 <= data[pos + 1] <= 0xEF:
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        pos += 2 + length
+    return pos
+
+
+def _insert_segment(data, marker, payload):
+    pos = _segments_end(data)
+    segment = struct.pack(">BBH", 0xFF, marker, len(payload) + 2) + payload
+    return data[:pos] + segment + data[pos:], pos
+
+
+def _mpf_payload(primary_size, aux_size, aux_offset):
+    """Segmento APP2 'MPF' com dois MP Entries (principal + gain map)"""
+    entries_offset = 8 + 2 + 3 * 12 + 4
+    ifd = struct.pack(">2sHI", b"MM", 0x2A, 8)
+    ifd += struct.pack(">H", 3)
+    ifd += struct.pack(">HHI4s", 0xB000, 7, 4, b"0100")               # MPFVersion
+    ifd += struct.pack(">HHII", 0xB001, 4, 1, 2)                      # NumberOfImages
+    ifd += struct.pack(">HHII", 0xB002, 7, 32, entries_offset)        # MPEntry
+    ifd += struct.pack(">I", 0)
+    ifd += struct.pack(">IIIHH", MP_TYPE_PRIMARY, primary_size, 0, 0, 0)
+    ifd += struct.pack(">IIIHH", MP_TYPE_UNDEFINED, aux_size, aux_offset, 0, 0)
+    return b"MPF\x00" + ifd
+
+
+def apple_hdr_exif(hdr_gamma):
+    """
+    Bloco EXIF (TIFF big-endian) com só o IFD Exif e o maker note da Apple:
+    cabeçalho "Apple iOS", versão (0x0001) e HDRGamma (0x0021, float), que
+    o app Fotos lê para estender o brilho. Montado em memória.
+    """
+    makernote = APPLE_MAKERNOTE_HEADER + struct.pack(">H", 2)
+    makernote += struct.pack(">HHIi", TAG_APPLE_VERSION, 9, 1, APPLE_MAKERNOTE_VERSION)
+    makernote += struct.pack(">HHIf", TAG_APPLE_HDR_GAMMA, 11, 1, hdr_gamma)
+    makernote += struct.pack(">I", 0)
+
+    exif_ifd_offset = 8 + 2 + 12 + 4
+    makernote_offset = exif_ifd_offset + 2 + 12 + 4
+    tiff = struct.pack(">2sHI", b"MM", 0x2A, 8)
+    tiff += struct.pack(">HHHII", 1, TAG_EXIF_IFD, 4, 1, exif_ifd_offset) + struct.pack(">I", 0)
+    tiff += struct.pack(">HHHII", 1, TAG_MAKERNOTE, 7, len(makernote), makernote_offset)
+    tiff += struct.pack(">I", 0)
+    return b"Exif\x00\x00" + tiff + makernote
+
+
+def encode_jpeg(img, quality=98, gain_map=None, exif=None):
+    """
+    JPEG em memória; com gain_map, anexa o mapa como imagem auxiliar MPF.
+    exif (ex. apple_hdr_exif) vai no APP1 da imagem principal.
+    """
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=quality, subsampling=0, exif=exif or b"")
+    primary = buffer.getvalue()
+    if gain_map is None:
+        return primary
+
+    buffer = io.BytesIO()
+    gain_map.save(buffer, 'JPEG', quality=GAIN_MAP_QUALITY)
+    aux, _ = _insert_segment(buffer.getvalue(), 0xE1, XMP_HEADER + GAIN_MAP_XMP)
+
+    # Tamanho do APP2 é fixo, então os offsets podem ser calculados antes
+    placeholder = _mpf_payload(0, 0, 0)
+    primary_size = len(primary) + len(placeholder) + 4
+    mp_header = _segments_end(primary) + 4 + 4  # marcador+tamanho, "MPF\0"
+    payload = _mpf_payload(primary_size, len(aux), primary_size - mp_header)
+    primary, _ = _insert_segment(primary, 0xE2, payload)
+    return primary + aux
+
+
+def available_formats():
+    """Formatos de exportação suportados pelos plugins instalados"""
+    formats = ['jpg', 'png']
+    if features.check('webp'):
+        formats.append('webp')
+    if HEIF_AVAILABLE:
+        formats.append('heic')
+    if features.check('avif'):
+        formats.append('avif')
+    return formats
+
+
+def encode_image(img, fmt, quality=DEFAULT_QUALITY, speed=DEFAULT_SPEED, threads=None):
+    """
+    Codifica a imagem em memória no formato pedido.
+    speed vai de 0 a 10 e é convertido para o esforço de cada encoder;
+    threads limita as threads do encoder quando ele permite (HEIC/AVIF).
+    """
+    speed = min(max(int(speed), 0), 10)
+    threads = threads or os.cpu_count() or 1
+    buffer = io.BytesIO()
+
+    if fmt == 'jpg':
+        return encode_jpeg(img, quality=quality)
+    elif fmt == 'png':
+        img.save(buffer, 'PNG', compress_level=9 - round(speed * 0.9))
+    elif fmt == 'webp':
+        img.save(buffer, 'WEBP', quality=quality, method=6 - round(speed * 0.6))
+    elif fmt == 'heic':
+        if not register_heif():
+            raise RuntimeError("HEIC export requires pillow-heif")
+        img.save(buffer, 'HEIF', quality=quality, enc_params={
+            "preset": X265_PRESETS[min(speed, len(X265_PRESETS) - 1)],
+            "x265:pools": str(threads),
+        })
+    elif fmt == 'avif':
+        if not features.check('avif'):
+            raise RuntimeError("AVIF export requires Pillow built with libavif")
+        img.save(buffer, 'AVIF', quality=quality, speed=speed, max_threads=threads)
+    else:
+        raise ValueError(f"unsupported export format: {fmt}")
+
+    return buffer.getvalue()
+
+
+def benchmark_formats(img, formats=None, quality=DEFAULT_QUALITY, speed=DEFAULT_SPEED,
+                      threads=None, repeat=3):
+    """Mede tempo de encode (melhor de N) e tamanho para cada formato"""
+    results = []
+    for fmt in formats or available_formats():
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = encode_image(img, fmt, quality=quality, speed=speed, threads=threads)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results.append({
+            "format": fmt,
+            "seconds": best,
+            "bytes": len(data),
+            "bpp": len(data) * 8 / (img.width * img.height),
+        })
+    return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark de encode por formato")
+    parser.add_argument("image")
+    parser.add_argument("--formats", nargs="+", default=None)
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY)
+    parser.add_argument("--speed", type=int, default=DEFAULT_SPEED)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    img = Image.open(args.image).convert("RGB")
+    print(f"{img.width}x{img.height} // quality={args.quality} speed={args.speed}")
+    print(f"{'FORMAT':<8}{'ENCODE ms':>12}{'KB':>12}{'bits/px':>10}")
+    for row in benchmark_formats(img, args.formats, args.quality, args.speed,
+                                 args.threads, args.repeat):
+        print(f"{row['format']:<8}{row['seconds'] * 1000:>12.1f}"
+              f"{row['bytes'] / 1024:>12.1f}{row['bpp']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
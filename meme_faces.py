@@ -0,0 +1,69 @@
+"""
+Detecção de olhos/rostos para posicionar o lens flare
+Haar cascades do OpenCV rodando numa cópia reduzida da imagem
+"""
+
+import os
+import cv2
+import numpy as np
+
+# Lado maior da cópia usada na detecção: limita o custo independente do input
+DETECT_MAX_SIZE = 480
+MAX_FLARES = 5
+
+_cascades = {}
+
+
+def _cascade(name):
+    """Carrega (uma vez) um cascade do OpenCV; None se não vier no pacote"""
+    if name not in _cascades:
+        # opencv-python 5.x não inclui mais os XML dos cascades
+        data_dir = getattr(getattr(cv2, "data", None), "haarcascades", "")
+        path = os.path.join(data_dir, name)
+        classifier = cv2.CascadeClassifier(path) if os.path.exists(path) else None
+        _cascades[name] = classifier if classifier is not None and not classifier.empty() else None
+    return _cascades[name]
+
+
+def detect_flare_points(img):
+    """
+    Retorna até MAX_FLARES pontos (x, y) normalizados em 0..1 sobre os olhos.
+    Sem olhos detectados, usa a altura típica dos olhos em cada rosto.
+    Coordenadas normalizadas valem para o preview e para o export.
+    """
+    face_cascade = _cascade("haarcascade_frontalface_default.xml")
+    eye_cascade = _cascade("haarcascade_eye.xml")
+    if face_cascade is None:
+        return []
+
+    small = img.convert("L")
+    scale = DETECT_MAX_SIZE / max(small.size)
+    if scale < 1:
+        small = small.resize((int(small.width * scale), int(small.height * scale)))
+    gray = cv2.equalizeHist(np.asarray(small))
+    h, w = gray.shape
+
+    faces = face_cascade.detectMultiScale(
+        gray, scaleFactor=1.2, minNeighbors=5, minSize=(max(w, h) // 20,) * 2
+    )
+
+    points = []
+    for fx, fy, fw, fh in sorted(faces, key=lambda f: -f[2] * f[3]):
+        # Olhos ficam na metade de cima do rosto
+        roi = gray[fy:fy + fh // 2, fx:fx + fw]
+        eyes = []
+        if eye_cascade is not None:
+            eyes = eye_cascade.detectMultiScale(
+                roi, scaleFactor=1.1, minNeighbors=5, minSize=(fw // 8,) * 2
+            )
+        if len(eyes) >= 2:
+            eyes = sorted(eyes, key=lambda e: -e[2] * e[3])[:2]
+            for ex, ey, ew, eh in eyes:
+                points.append(((fx + ex + ew / 2) / w, (fy + ey + eh / 2) / h))
+        else:
+            for rel_x in (0.3, 0.7):
+                points.append(((fx + fw * rel_x) / w, (fy + fh * 0.4) / h))
+        if len(points) >= MAX_FLARES:
+            break
+
+    return points[:MAX_FLARES]
@@ -0,0 +1,163 @@
+"""
+Modo filtro: imagem codificada no stdin, resultado no stdout
+    cat in.jpg | python3 hdr_meme_maker.py --preset CRISPY --format jpg > out.jpg
+Sem GUI e sem arquivos temporários; só importa NumPy/Pillow (sem Qt,
+OpenCV ou Numba) para o startup ser curto num pipeline de shell.
+"""
+
+import os
+import sys
+import time
+
+_IMPORT_START = time.perf_counter()
+
+import io
+
+from PIL import Image, UnidentifiedImageError
+
+import meme_effects
+import meme_export
+import meme_kernels
+import meme_params
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+BOOL_PARAMS = ("lens_flare", "bulge")
+
+
+def parse_param(text):
+    """'noise=20' -> ('noise', 20); lens_flare/bulge aceitam 0/1"""
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise ValueError(f"expected PARAM=VALUE, got {text!r}")
+    if key not in meme_params.DEFAULT_PARAMS:
+        raise ValueError(f"unknown parameter: {key}")
+    if key in BOOL_PARAMS:
+        return key, value.lower() in ("1", "true", "on", "yes")
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"{key} expects an integer, got {value!r}") from None
+    meme_params.check_range(key, value)
+    return key, value
+
+
+def decode(data):
+    """Abre os bytes da imagem; registra o HEIF só se o Pillow não reconhecer"""
+    try:
+        img = Image.open(io.BytesIO(data))
+    except UnidentifiedImageError:
+        if not meme_export.register_heif():
+            raise
+        img = Image.open(io.BytesIO(data))
+    return img.convert("RGB")
+
+
+def run(data, params, fmt="jpg", quality=None, speed=meme_export.DEFAULT_SPEED, seed=None,
+        threads=None):
+    """
+    Decodifica, aplica os efeitos e codifica, tudo em memória.
+    Retorna (bytes, {etapa: segundos}).
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    img = decode(data)
+    timings["decode"] = time.perf_counter() - start
+
+    # Sem OpenCV não há detecção de olhos: o flare usa os pontos mais claros
+    start = time.perf_counter()
+    processed = meme_effects.apply_all_effects(img, params, seed=seed)
+    timings["effects"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if fmt == 'jpg':
+        hdr_gamma = params["hdr_gamma"] / 10.0
+        if hdr_gamma > 0:
+            out = meme_export.encode_jpeg(
+                processed, quality=quality or 98,
+                gain_map=meme_export.compute_gain_map(processed),
+                exif=meme_export.apple_hdr_exif(hdr_gamma),
+            )
+        else:
+            out = meme_export.encode_jpeg(processed, quality=quality or 98)
+    else:
+        out = meme_export.encode_image(processed, fmt, quality=quality or meme_export.DEFAULT_QUALITY,
+                                       speed=speed, threads=threads)
+    timings["encode"] = time.perf_counter() - start
+    return out, timings
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="hdr_meme_maker",
+        description="Filtro stdin -> stdout: cat in.jpg | hdr_meme_maker --preset CRISPY > out.jpg",
+    )
+    parser.add_argument("input", nargs="?", default="-", choices=["-"],
+                        help="'-' lê a imagem do stdin (o padrão)")
+    parser.add_argument("--preset", type=str.upper, default=None,
+                        choices=list(meme_params.PRESETS),
+                        help="sem preset parte dos valores neutros dos sliders")
+    parser.add_argument("--set", dest="overrides", action="append", default=[],
+                        metavar="PARAM=VALUE", help="ajusta um parâmetro por cima do preset")
+    parser.add_argument("--format", default="jpg", choices=list(meme_export.EXPORT_FORMATS))
+    parser.add_argument("--quality", type=int, default=None)
+    parser.add_argument("--speed", type=int, default=meme_export.DEFAULT_SPEED)
+    parser.add_argument("--threads", type=int, default=None,
+                        help="threads do encoder HEIC/AVIF (padrão: todos os núcleos)")
+    parser.add_argument("--seed", type=int, default=None, help="fixa noise/glitch/flare")
+    parser.add_argument("--timing", action="store_true", help="tempos por etapa no stderr")
+    args = parser.parse_args(argv)
+
+    if sys.stdin.isatty():
+        parser.error("expected an encoded image on stdin")
+
+    # Numba custaria mais no import/JIT do que economiza numa imagem só;
+    # HDR_MEME_KERNELS no ambiente continua valendo
+    if "HDR_MEME_KERNELS" not in os.environ:
+        meme_kernels.use_backend("numpy")
+    if args.threads is not None and args.threads < 1:
+        parser.error("--threads must be at least 1")
+
+    try:
+        # Sem --preset: valores neutros (como a GUI abre), não o RESET com HDR/VHS em 10
+        if args.preset is None:
+            params = dict(meme_params.DEFAULT_PARAMS)
+        else:
+            params = meme_params.preset_params(args.preset)
+        params.update(parse_param(text) for text in args.overrides)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    data = sys.stdin.buffer.read()
+    read_seconds = time.perf_counter() - start
+
+    try:
+        out, timings = run(data, params, args.format, args.quality, args.speed, args.seed,
+                            args.threads)
+    except UnidentifiedImageError:
+        print("hdr_meme_maker: stdin is not a supported image", file=sys.stderr)
+        return 1
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"hdr_meme_maker: {e}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    sys.stdout.buffer.write(out)
+    sys.stdout.buffer.flush()
+    write_seconds = time.perf_counter() - start
+
+    if args.timing:
+        steps = {"import": _IMPORT_SECONDS, "read": read_seconds, **timings, "write": write_seconds}
+        for step, seconds in steps.items():
+            print(f"{step:<8}{seconds * 1000:>9.1f} ms", file=sys.stderr)
+        print(f"{'total':<8}{sum(steps.values()) * 1000:>9.1f} ms "
+              f"({len(data) // 1024} KB -> {len(out) // 1024} KB)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
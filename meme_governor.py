@@ -0,0 +1,97 @@
+"""
+Governador de qualidade do preview
+Mede cada render e, durante arrastes de slider, escolhe o nível de
+qualidade (estágios caros desligados, resolução reduzida) que cabe na
+latência alvo; ao soltar, o preview volta à qualidade total.
+"""
+
+from meme_params import DEFAULT_PARAMS
+
+DEFAULT_TARGET_MS = 50
+# Debounce fora de arrastes (mudanças pontuais, presets)
+IDLE_DEBOUNCE_MS = 80
+
+# Estágios caros desligados no rascunho (valor neutro = padrão dos sliders);
+# os de corrupção codificam e decodificam um JPEG inteiro a cada render
+EXPENSIVE_STAGES = (
+    "bloom", "lens_flare", "jpeg_quality",
+    "datamosh", "quant_tamper", "mcu_shuffle",
+)
+
+# Níveis do mais fiel ao mais barato: (fator de redução, pula estágios caros?)
+LEVELS = [
+    (1, False),
+    (1, True),
+    (2, True),
+    (4, True),
+]
+
+# Peso da medida nova na média móvel do tempo de cada nível
+SMOOTHING = 0.5
+
+
+class PreviewGovernor:
+    def __init__(self, target_ms=DEFAULT_TARGET_MS):
+        self.target_ms = target_ms
+        self.level = 0
+        self.last_ms = 0.0
+        self.times = {}     # nível -> ms (média móvel)
+
+    def reset(self):
+        """Esquece os tempos medidos (nova imagem ou novo tamanho de preview)"""
+        self.times = {}
+
+    def estimate(self, level):
+        """Tempo esperado do nível: medido, ou escalado pelo nº de pixels do mais próximo"""
+        if level in self.times:
+            return self.times[level]
+        if not self.times:
+            return 0.0
+        known = min(self.times, key=lambda k: (abs(k - level), k))
+        ratio = LEVELS[known][0] / LEVELS[level][0]
+        return self.times[known] * ratio * ratio
+
+    def choose(self, dragging):
+        """Nível para o próximo render: qualidade total fora de arrastes"""
+        self.level = 0
+        if dragging:
+            while self.level < len(LEVELS) - 1 and self.estimate(self.level) > self.target_ms:
+                self.level += 1
+        return self.level
+
+    def record(self, level, seconds):
+        ms = seconds * 1000.0
+        self.last_ms = ms
+        previous = self.times.get(level)
+        self.times[level] = ms if previous is None else previous + (ms - previous) * SMOOTHING
+
+    def debounce_ms(self, dragging):
+        """Espera antes do próximo render: no arraste, o que sobra da latência alvo"""
+        if not dragging:
+            return IDLE_DEBOUNCE_MS
+        return max(0, int(self.target_ms - self.last_ms))
+
+    def draft_params(self, params, level):
+        if not LEVELS[level][1]:
+            return params
+        return {**params, **{key: DEFAULT_PARAMS[key] for key in EXPENSIVE_STAGES}}
+
+    def draft_source(self, img, level):
+        factor = LEVELS[level][0]
+        return img.reduce(factor) if factor > 1 else img
+
+    def describe(self, level):
+        factor, skip = LEVELS[level]
+        if level == 0:
+            return "full"
+        parts = [f"1/{factor} res"] if factor > 1 else []
+        if skip:
+            parts.append("no bloom/flare/JPEG/corrupt")
+        return ", ".join(parts)
+
+
+def upscale(img, size):
+    """Amplia o rascunho para o tamanho do preview (barato; só durante arrastes)"""
+    # Pillow só é importado com uma imagem carregada (startup da GUI)
+    from PIL import Image
+    return img if img.size == tuple(size) else img.resize(size, Image.Resampling.BILINEAR)
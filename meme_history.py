@@ -0,0 +1,144 @@
+"""
+Histórico de undo/redo dos parâmetros com os renders do preview
+Renders são guardados como snapshot + deltas comprimidos: cada passo
+guarda só a diferença para o último snapshot, então voltar é instantâneo
+(um zlib + uma soma) sem rodar a cadeia de efeitos de novo.
+"""
+
+import zlib
+
+import numpy as np
+from PIL import Image
+
+MAX_STEPS = 200
+MAX_BYTES = 32 * 1024 * 1024
+# Deltas por snapshot: limita quanto um delta pode divergir da base
+SNAPSHOT_INTERVAL = 8
+COMPRESS_LEVEL = 1
+
+
+class _Step:
+    def __init__(self, params):
+        self.params = dict(params)
+        self.shape = None
+        self.base = None    # snapshot do qual este delta depende (None = é snapshot)
+        self.data = None    # bytes comprimidos (None = render descartado)
+
+
+class History:
+    """Pilha de undo/redo; parâmetros ficam sempre, renders até max_bytes"""
+
+    def __init__(self, max_steps=MAX_STEPS, max_bytes=MAX_BYTES):
+        self.max_steps = max_steps
+        self.max_bytes = max_bytes
+        self.steps = []
+        self.index = -1
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self.steps)
+
+    @property
+    def current(self):
+        return self.steps[self.index] if self.steps else None
+
+    def can_undo(self):
+        return self.index > 0
+
+    def can_redo(self):
+        return self.index < len(self.steps) - 1
+
+    def record(self, params, render=None):
+        """
+        Registra o estado atual. Parâmetros iguais ao passo atual não criam
+        passo novo, só guardam o render se ele ainda não existir.
+        Gravar depois de um undo descarta os passos de redo.
+        """
+        step = self.current
+        if step is None or step.params != params:
+            for dropped in self.steps[self.index + 1:]:
+                self._drop_render(dropped)
+            del self.steps[self.index + 1:]
+            step = _Step(params)
+            self.steps.append(step)
+            if len(self.steps) > self.max_steps:
+                self._drop_render(self.steps.pop(0))
+            self.index = len(self.steps) - 1
+        if render is not None and step.data is None:
+            self._store(step, np.asarray(render))
+            self._evict()
+        return step
+
+    def undo(self):
+        if not self.can_undo():
+            return None
+        self.index -= 1
+        return self.current
+
+    def redo(self):
+        if not self.can_redo():
+            return None
+        self.index += 1
+        return self.current
+
+    def render(self, step, size=None):
+        """Render guardado do passo (PIL) ou None se descartado/de outro tamanho"""
+        if step.data is None or (size is not None and step.shape[1::-1] != tuple(size)):
+            return None
+        arr = self._decode(step)
+        if step.base is not None:
+            arr += self._decode(step.base)   # uint8 volta com o mesmo wraparound
+        return Image.fromarray(arr)
+
+    def clear_renders(self):
+        """Descarta os renders (ex. nova imagem carregada), mantendo os parâmetros"""
+        for step in self.steps:
+            step.data = None
+            step.base = None
+        self.nbytes = 0
+
+    def _decode(self, step):
+        return np.frombuffer(zlib.decompress(step.data), np.uint8).reshape(step.shape).copy()
+
+    def _snapshot_for(self, step, arr):
+        """Snapshot do passo anterior mais próximo que ainda aceita deltas"""
+        position = self.steps.index(step)
+        for prev in reversed(self.steps[:position]):
+            if prev.data is None:
+                continue
+            base = prev.base or prev
+            if base.data is None or base.shape != arr.shape:
+                return None
+            deltas = sum(1 for s in self.steps if s.base is base)
+            return base if deltas < SNAPSHOT_INTERVAL else None
+        return None
+
+    def _store(self, step, arr):
+        base = self._snapshot_for(step, arr)
+        if base is not None:
+            arr = arr - self._decode(base)   # uint8: diferença com wraparound
+        step.shape = arr.shape
+        step.base = base
+        step.data = zlib.compress(np.ascontiguousarray(arr, np.uint8).tobytes(), COMPRESS_LEVEL)
+        self.nbytes += len(step.data)
+
+    def _drop_render(self, step):
+        if step.data is None:
+            return
+        self.nbytes -= len(step.data)
+        step.data = None
+        step.base = None
+        # Deltas que dependiam deste snapshot não têm mais como decodificar
+        for other in self.steps:
+            if other.base is step:
+                self._drop_render(other)
+
+    def _evict(self):
+        """Descarta os renders mais antigos (grupos snapshot+deltas) acima do limite"""
+        current = self.current
+        keep = current.base or current
+        for step in list(self.steps):
+            if self.nbytes <= self.max_bytes:
+                break
+            if step.data is not None and step.base is None and step is not keep:
+                self._drop_render(step)
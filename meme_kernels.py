@@ -0,0 +1,153 @@
+"""
+Kernels por pixel dos efeitos (vibrance, highlights, shadows, bloom, deep fry)
+Backend Numba (opcional, multi-core, uma passada) com fallback em NumPy
+"""
+
+import importlib.util
+import os
+import numpy as np
+
+# HDR_MEME_KERNELS=numpy força o fallback mesmo com Numba instalado
+FORCE_NUMPY = os.environ.get("HDR_MEME_KERNELS") == "numpy"
+
+# O Numba (~150 ms de import) só é carregado no primeiro uso de um kernel,
+# via meme_kernels_numba
+NUMBA_AVAILABLE = not FORCE_NUMPY and importlib.util.find_spec("numba") is not None
+
+BACKEND = "numba" if NUMBA_AVAILABLE else "numpy"
+
+
+# === NUMPY ===
+def highlights_mask(arr):
+    """Máscara 0..1 das áreas claras (luminância acima de 128)"""
+    luminance = 0.299 * arr[:,:,0] + 0.587 * arr[:,:,1] + 0.114 * arr[:,:,2]
+    return np.clip((luminance - 128) / 127, 0, 1)
+
+
+def bloom_mask(blur_arr):
+    """Máscara 0..1 das áreas que recebem bloom (canal máximo acima de 180)"""
+    luminance = np.maximum(np.maximum(blur_arr[:,:,0], blur_arr[:,:,1]), blur_arr[:,:,2])
+    return np.clip((luminance - 180) / 75, 0, 1)
+
+
+def _vibrance_numpy(img_arr, amount):
+    arr = img_arr.astype(np.float32)
+    gray = np.mean(arr, axis=2, keepdims=True)
+    saturation = np.std(arr, axis=2, keepdims=True) / 128.0
+    mask = 1.0 - np.clip(saturation, 0, 1)
+    arr = gray + (arr - gray) * (1 + mask * (amount - 1))
+    return np.clip(arr, 0, 255).astype(np.uint8)
+
+
+def _highlights_numpy(img_arr, amount):
+    arr = img_arr.astype(np.float32)
+    mask = highlights_mask(arr)[:,:,np.newaxis]
+    arr = arr * (1 + mask * (amount - 1))
+    return np.clip(arr, 0, 255).astype(np.uint8)
+
+
+def _shadows_numpy(img_arr, amount):
+    arr = img_arr.astype(np.float32)
+    luminance = 0.299 * arr[:,:,0] + 0.587 * arr[:,:,1] + 0.114 * arr[:,:,2]
+    mask = np.clip((128 - luminance) / 128, 0, 1)[:,:,np.newaxis]
+    arr = arr + mask * (amount - 1) * 50
+    return np.clip(arr, 0, 255).astype(np.uint8)
+
+
+def _bloom_numpy(img_arr, blur_img_arr, amount):
+    arr = img_arr.astype(np.float32)
+    blur_arr = blur_img_arr.astype(np.float32)
+    mask = bloom_mask(blur_arr)[:,:,np.newaxis]
+    result = arr + blur_arr * mask * amount
+    return np.clip(result, 0, 255).astype(np.uint8)
+
+
+def _channel_gains_numpy(img_arr, r_gain, g_gain, b_gain):
+    arr = img_arr.astype(np.float32)
+    arr[:,:,0] = np.clip(arr[:,:,0] * r_gain, 0, 255)
+    arr[:,:,1] = np.clip(arr[:,:,1] * g_gain, 0, 255)
+    arr[:,:,2] = np.clip(arr[:,:,2] * b_gain, 0, 255)
+    return arr.astype(np.uint8)
+
+
+def set_threads(count):
+    """Limita as threads dos kernels Numba (ex. 1 por worker de um pool)"""
+    if BACKEND == "numba":
+        import numba
+        numba.set_num_threads(max(1, min(count, numba.config.NUMBA_NUM_THREADS)))
+
+
+_KERNELS = {
+    "vibrance": (_vibrance_numpy, "_vibrance_numba"),
+    "highlights": (_highlights_numpy, "_highlights_numba"),
+    "shadows": (_shadows_numpy, "_shadows_numba"),
+    "bloom": (_bloom_numpy, "_bloom_numba"),
+    "channel_gains": (_channel_gains_numpy, "_channel_gains_numba"),
+}
+
+
+def use_backend(backend):
+    """Troca o backend padrão do processo ("numba" exige Numba disponível)"""
+    global BACKEND
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        raise RuntimeError("numba is not installed (or HDR_MEME_KERNELS=numpy)")
+    BACKEND = backend
+    # Kernels já resolvidos por __getattr__ ficaram no backend antigo
+    for name in _KERNELS:
+        globals().pop(name, None)
+
+
+def get_kernel(name, backend=None):
+    """Kernel pelo nome no backend pedido (padrão: BACKEND)"""
+    numpy_impl, numba_name = _KERNELS[name]
+    if (backend or BACKEND) == "numba":
+        import meme_kernels_numba
+        return getattr(meme_kernels_numba, numba_name)
+    return numpy_impl
+
+
+def __getattr__(name):
+    # meme_kernels.vibrance etc. resolvem o backend no primeiro acesso
+    if name in _KERNELS:
+        kernel = get_kernel(name)
+        globals()[name] = kernel
+        return kernel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def check_parity(size=(480, 640), seed=0, tolerance=1):
+    """
+    Compara Numba x NumPy em uma imagem aleatória.
+    Retorna {kernel: diferença máxima}; float32 em ordem diferente pode
+    arredondar 1 nível para o outro lado, daí a tolerância.
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("numba is not installed (or HDR_MEME_KERNELS=numpy)")
+
+    rng = np.random.default_rng(seed)
+    arr = rng.integers(0, 256, size=(*size, 3), dtype=np.uint8)
+    blur = rng.integers(0, 256, size=(*size, 3), dtype=np.uint8)
+    cases = {
+        "vibrance": [(arr, 1.7), (arr, 3.0)],
+        "highlights": [(arr, 0.4), (arr, 2.5)],
+        "shadows": [(arr, 0.2), (arr, 3.0)],
+        "bloom": [(arr, blur, 0.5), (arr, blur, 1.0)],
+        "channel_gains": [(arr, 1.9, 1.45, 0.4), (arr, 1.3, 1.15, 0.8)],
+    }
+
+    diffs = {}
+    for name, arg_sets in cases.items():
+        worst = 0
+        for args in arg_sets:
+            expected = get_kernel(name, "numpy")(*args).astype(np.int16)
+            actual = get_kernel(name, "numba")(*args).astype(np.int16)
+            worst = max(worst, int(np.abs(expected - actual).max()))
+        if worst > tolerance:
+            raise AssertionError(f"{name}: numba differs from numpy by {worst} levels")
+        diffs[name] = worst
+    return diffs
+
+
+if __name__ == "__main__":
+    for kernel, diff in check_parity().items():
+        print(f"{kernel:<14} max diff {diff}")
@@ -0,0 +1,105 @@
+"""
+Kernels Numba dos efeitos por pixel (float32, uma passada, multi-core)
+Importado por meme_kernels só no primeiro uso: o import do Numba é caro
+"""
+
+import numpy as np
+from numba import njit, prange
+
+_F0 = np.float32(0.0)
+_F255 = np.float32(255.0)
+
+
+@njit(inline="always")
+def _clip_u8(v):
+    return np.uint8(min(max(v, _F0), _F255))
+
+
+@njit(parallel=True, cache=True)
+def _vibrance_numba(img_arr, amount):
+    h, w = img_arr.shape[:2]
+    out = np.empty((h, w, 3), dtype=np.uint8)
+    k = np.float32(amount - 1)
+    for y in prange(h):
+        for x in range(w):
+            r = np.float32(img_arr[y, x, 0])
+            g = np.float32(img_arr[y, x, 1])
+            b = np.float32(img_arr[y, x, 2])
+            gray = (r + g + b) / np.float32(3)
+            dr, dg, db = r - gray, g - gray, b - gray
+            std = np.sqrt((dr * dr + dg * dg + db * db) / np.float32(3))
+            mask = np.float32(1) - min(max(std / np.float32(128), _F0), np.float32(1))
+            gain = np.float32(1) + mask * k
+            out[y, x, 0] = _clip_u8(gray + dr * gain)
+            out[y, x, 1] = _clip_u8(gray + dg * gain)
+            out[y, x, 2] = _clip_u8(gray + db * gain)
+    return out
+
+
+@njit(parallel=True, cache=True)
+def _highlights_numba(img_arr, amount):
+    h, w = img_arr.shape[:2]
+    out = np.empty((h, w, 3), dtype=np.uint8)
+    k = np.float32(amount - 1)
+    for y in prange(h):
+        for x in range(w):
+            r = np.float32(img_arr[y, x, 0])
+            g = np.float32(img_arr[y, x, 1])
+            b = np.float32(img_arr[y, x, 2])
+            lum = np.float32(0.299) * r + np.float32(0.587) * g + np.float32(0.114) * b
+            mask = min(max((lum - np.float32(128)) / np.float32(127), _F0), np.float32(1))
+            gain = np.float32(1) + mask * k
+            out[y, x, 0] = _clip_u8(r * gain)
+            out[y, x, 1] = _clip_u8(g * gain)
+            out[y, x, 2] = _clip_u8(b * gain)
+    return out
+
+
+@njit(parallel=True, cache=True)
+def _shadows_numba(img_arr, amount):
+    h, w = img_arr.shape[:2]
+    out = np.empty((h, w, 3), dtype=np.uint8)
+    k = np.float32(amount - 1)
+    for y in prange(h):
+        for x in range(w):
+            r = np.float32(img_arr[y, x, 0])
+            g = np.float32(img_arr[y, x, 1])
+            b = np.float32(img_arr[y, x, 2])
+            lum = np.float32(0.299) * r + np.float32(0.587) * g + np.float32(0.114) * b
+            mask = min(max((np.float32(128) - lum) / np.float32(128), _F0), np.float32(1))
+            lift = mask * k * np.float32(50)
+            out[y, x, 0] = _clip_u8(r + lift)
+            out[y, x, 1] = _clip_u8(g + lift)
+            out[y, x, 2] = _clip_u8(b + lift)
+    return out
+
+
+@njit(parallel=True, cache=True)
+def _bloom_numba(img_arr, blur_img_arr, amount):
+    h, w = img_arr.shape[:2]
+    out = np.empty((h, w, 3), dtype=np.uint8)
+    a = np.float32(amount)
+    for y in prange(h):
+        for x in range(w):
+            br = np.float32(blur_img_arr[y, x, 0])
+            bg = np.float32(blur_img_arr[y, x, 1])
+            bb = np.float32(blur_img_arr[y, x, 2])
+            lum = max(max(br, bg), bb)
+            mask = min(max((lum - np.float32(180)) / np.float32(75), _F0), np.float32(1))
+            out[y, x, 0] = _clip_u8(np.float32(img_arr[y, x, 0]) + br * mask * a)
+            out[y, x, 1] = _clip_u8(np.float32(img_arr[y, x, 1]) + bg * mask * a)
+            out[y, x, 2] = _clip_u8(np.float32(img_arr[y, x, 2]) + bb * mask * a)
+    return out
+
+
+@njit(parallel=True, cache=True)
+def _channel_gains_numba(img_arr, r_gain, g_gain, b_gain):
+    h, w = img_arr.shape[:2]
+    out = np.empty((h, w, 3), dtype=np.uint8)
+    gr, gg, gb = np.float32(r_gain), np.float32(g_gain), np.float32(b_gain)
+    for y in prange(h):
+        for x in range(w):
+            out[y, x, 0] = _clip_u8(np.float32(img_arr[y, x, 0]) * gr)
+            out[y, x, 1] = _clip_u8(np.float32(img_arr[y, x, 1]) * gg)
+            out[y, x, 2] = _clip_u8(np.float32(img_arr[y, x, 2]) * gb)
+    return out
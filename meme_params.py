@@ -0,0 +1,115 @@
+"""
+Parâmetros do HDR Meme Maker: valores padrão, faixas dos sliders e presets
+Só Python puro (sem NumPy/Pillow): a GUI importa no startup, antes de
+qualquer imagem ser carregada.
+"""
+
+# Valores padrão dos sliders (mesma escala inteira da GUI)
+DEFAULT_PARAMS = {
+    "saturation": 10,
+    "contrast": 10,
+    "brightness": 10,
+    "sharpness": 10,
+    "vibrance": 10,
+    "hdr_gamma": 0,
+    "highlights": 10,
+    "shadows": 10,
+    "bloom": 0,
+    "fry_intensity": 0,
+    "jpeg_quality": 100,
+    "noise": 0,
+    "posterize": 32,
+    "color_shift": 0,
+    "chromatic": 0,
+    "scanlines": 0,
+    "pixelate": 1,
+    "vhs": 0,
+    "glitch": 0,
+    "datamosh": 0,
+    "quant_tamper": 0,
+    "mcu_shuffle": 0,
+    "lens_flare": False,
+    "bulge": False,
+}
+
+# Faixa (mín, máx) de cada slider; vale para GUI, filtro e sweep
+SLIDER_RANGES = {
+    "saturation": (0, 50),
+    "contrast": (0, 30),
+    "brightness": (5, 20),
+    "sharpness": (0, 50),
+    "vibrance": (0, 30),
+    "hdr_gamma": (0, 40),
+    "highlights": (0, 30),
+    "shadows": (0, 30),
+    "bloom": (0, 20),
+    "fry_intensity": (0, 30),
+    "jpeg_quality": (1, 100),
+    "noise": (0, 50),
+    "posterize": (2, 32),
+    "color_shift": (0, 30),
+    "chromatic": (0, 30),
+    "scanlines": (0, 20),
+    "pixelate": (1, 32),
+    "vhs": (0, 20),
+    "glitch": (0, 20),
+    "datamosh": (0, 20),
+    "quant_tamper": (0, 20),
+    "mcu_shuffle": (0, 20),
+}
+
+
+def check_range(key, value):
+    """ValueError se o valor do slider estiver fora da faixa"""
+    lo, hi = SLIDER_RANGES[key]
+    if not lo <= value <= hi:
+        raise ValueError(f"{key} must be between {lo} and {hi}, got {value}")
+
+
+# Preset RESET: os mesmos valores que a GUI sempre aplicou (HDR/bloom/
+# color shift/scanlines/VHS ficam em 10, não no padrão dos sliders)
+RESET_PARAMS = {
+    **DEFAULT_PARAMS,
+    "hdr_gamma": 10,
+    "bloom": 10,
+    "color_shift": 10,
+    "scanlines": 10,
+    "vhs": 10,
+}
+
+# Presets: ajustes aplicados por cima de RESET_PARAMS
+PRESETS = {
+    "RESET": {},
+    "HDR GLOW": {
+        "saturation": 18, "contrast": 14, "hdr_gamma": 25, "highlights": 18, "bloom": 8,
+    },
+    "LIGHT FRY": {
+        "saturation": 25, "contrast": 18, "sharpness": 25, "fry_intensity": 10,
+        "jpeg_quality": 40,
+    },
+    "CRISPY": {
+        "saturation": 35, "contrast": 22, "sharpness": 40, "fry_intensity": 20,
+        "jpeg_quality": 15, "noise": 15,
+    },
+    "NUCLEAR": {
+        "saturation": 45, "contrast": 28, "sharpness": 50, "fry_intensity": 30,
+        "jpeg_quality": 5, "noise": 25, "hdr_gamma": 35, "lens_flare": True,
+    },
+    "CURSED": {
+        "saturation": 40, "contrast": 25, "fry_intensity": 25, "jpeg_quality": 8,
+        "noise": 30, "posterize": 8, "chromatic": 15, "glitch": 10, "bulge": True,
+    },
+}
+
+
+def preset_params(name):
+    """Parâmetros completos do preset (nome sem diferenciar maiúsculas)"""
+    return {**RESET_PARAMS, **PRESETS[name.upper()]}
+
+
+# Sliders que só viram metadado no export (HDRGamma + gain map), sem
+# estágio na cadeia de efeitos; num sweep dariam células idênticas
+METADATA_PARAMS = ("hdr_gamma",)
+
+# Sliders que mudam pixels e podem ser varridos num sweep
+SWEEP_PARAMS = [key for key in SLIDER_RANGES if key not in METADATA_PARAMS]
@@ -0,0 +1,152 @@
+"""
+Transporte de frames entre processos via shared memory
+O coordenador copia o frame decodificado para um bloco compartilhado e
+manda só o handle (nome, shape, dtype); o worker processa e escreve o
+resultado no mesmo bloco, sem serializar pixels pelo pipe.
+"""
+
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+from PIL import Image
+
+import meme_kernels
+from meme_effects import apply_all_effects
+
+# Blocos já abertos neste processo (workers reaproveitam entre tarefas)
+_attached = {}
+
+
+class SharedFrameSlots:
+    """Conjunto fixo de buffers de frame em shared memory, reaproveitados"""
+
+    def __init__(self, count, shape, dtype=np.uint8):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.blocks = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(count)]
+        self.free = deque(range(count))
+
+    def array(self, slot):
+        return np.ndarray(self.shape, self.dtype, buffer=self.blocks[slot].buf)
+
+    def handle(self, slot):
+        return self.blocks[slot].name, self.shape, self.dtype.str
+
+    def acquire(self):
+        return self.free.popleft()
+
+    def release(self, slot):
+        self.free.append(slot)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _init_worker():
+    # Paralelismo fica entre frames; kernels Numba rodam single-thread
+    meme_kernels.set_threads(1)
+
+
+def process_pool(workers):
+    """
+    Pool de workers para os efeitos. Usa forkserver (ou spawn): o runtime de
+    threads do Numba/TBB não sobrevive a fork de um processo que já o usou.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker)
+
+
+def start_tracker():
+    """
+    Sobe o resource tracker antes de criar o pool: workers só herdam o
+    tracker do coordenador se ele já estiver rodando.
+    """
+    resource_tracker.ensure_running()
+
+
+def attach(handle):
+    """Array NumPy sobre o bloco compartilhado indicado pelo handle"""
+    name, shape, dtype = handle
+    block = _attached.get(name)
+    if block is None:
+        # Workers compartilham o resource tracker do coordenador (ver
+        # start_tracker), então o registro extra do attach não vira "leak"
+        block = shared_memory.SharedMemory(name=name)
+        _attached[name] = block
+    return np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+
+def render_shared(handle, index, params, seed):
+    """Worker: processa o frame do bloco e grava o resultado no lugar"""
+    arr = attach(handle)
+    out = np.asarray(apply_all_effects(Image.fromarray(arr), params, seed=seed, frame_index=index))
+    if out.shape != arr.shape:
+        raise ValueError(f"effect chain changed frame shape {arr.shape} -> {out.shape}")
+    arr[...] = out
+
+
+def _echo_pickled(arr):
+    return arr
+
+
+def _echo_shared(handle):
+    arr = attach(handle)
+    arr[0, 0, 0] = 255 - arr[0, 0, 0]
+
+
+def benchmark_transport(shape=(6000, 8000, 3), frames=8, workers=2):
+    """
+    Ida e volta de frames por worker sem efeitos, só o custo de transporte.
+    Retorna segundos por frame para pickle e shared memory.
+    """
+    frame = np.random.default_rng(0).integers(0, 256, size=shape, dtype=np.uint8)
+    results = {}
+
+    start_tracker()
+    with process_pool(workers) as pool:
+        # Aquece os workers para não medir o spawn
+        list(pool.map(_echo_pickled, [np.zeros(1)] * workers))
+
+        start = time.perf_counter()
+        futures = [pool.submit(_echo_pickled, frame) for _ in range(frames)]
+        for future in futures:
+            np.asarray(future.result())
+        results["pickle"] = (time.perf_counter() - start) / frames
+
+        with SharedFrameSlots(frames, shape) as slots:
+            start = time.perf_counter()
+            futures = []
+            for _ in range(frames):
+                slot = slots.acquire()
+                slots.array(slot)[...] = frame
+                futures.append((pool.submit(_echo_shared, slots.handle(slot)), slot))
+            for future, slot in futures:
+                future.result()
+                slots.array(slot).copy()
+                slots.release(slot)
+            results["shm"] = (time.perf_counter() - start) / frames
+
+    return results
+
+
+if __name__ == "__main__":
+    shape = (6000, 8000, 3)
+    mb = np.prod(shape) / 1e6
+    print(f"frame {shape[1]}x{shape[0]} ({mb:.0f} MB)")
+    for transport, seconds in benchmark_transport(shape).items():
+        print(f"{transport:<8}{seconds * 1000:>10.1f} ms/frame{mb / seconds:>10.0f} MB/s")
@@ -0,0 +1,172 @@
+"""
+Sweep de parâmetros / contact sheet
+Decodifica uma vez, reaproveita os estágios anteriores ao parâmetro
+varrido e renderiza as variantes em paralelo.
+"""
+
+import os
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from meme_effects import apply_all_effects, stage_index
+from meme_params import SWEEP_PARAMS, check_range
+from meme_shm import SharedFrameSlots, attach, process_pool, start_tracker
+
+CELL_MAX_SIZE = 320
+LABEL_HEIGHT = 16
+SHEET_BG = (10, 10, 10)
+LABEL_COLOR = (0, 255, 0)
+
+
+def _segments(axes):
+    """Faixa [start, stop) de estágios que cada eixo precisa re-executar"""
+    starts = [stage_index(key) for key, _ in axes]
+    return list(zip(starts, starts[1:] + [None]))
+
+
+def _render_branch(img, params, axes, segments, seed, flare_points):
+    """
+    Renderiza a árvore de variantes a partir de img: cada valor do eixo
+    roda só até o estágio do próximo eixo, que reaproveita esse resultado.
+    """
+    if not axes:
+        return [({}, img)]
+
+    (key, values), (start, stop) = axes[0], segments[0]
+    results = []
+    for value in values:
+        p = {**params, key: value}
+        branch = apply_all_effects(img, p, seed=seed, flare_points=flare_points,
+                                   start=start, stop=stop)
+        for combo, out in _render_branch(branch, p, axes[1:], segments[1:], seed, flare_points):
+            results.append(({key: value, **combo}, out))
+    return results
+
+
+def _render_branch_shared(handle, params, axes, segments, seed, flare_points):
+    """Worker: um ramo do primeiro eixo a partir do prefixo em shared memory"""
+    img = Image.fromarray(np.array(attach(handle)))
+    return [(combo, np.asarray(out))
+            for combo, out in _render_branch(img, params, axes, segments, seed, flare_points)]
+
+
+def sweep(img, params, axes, seed=0, workers=None, flare_points=None):
+    """
+    Renderiza todas as combinações de axes ([(parâmetro, valores), ...]).
+    Retorna [(combinação, imagem)] em ordem row-major dos eixos dados.
+    """
+    ordered = sorted(axes, key=lambda axis: stage_index(axis[0]))
+    segments = _segments(ordered)
+
+    # Prefixo comum: tudo antes do primeiro estágio varrido roda uma vez
+    prefix = apply_all_effects(img, params, seed=seed, flare_points=flare_points,
+                               stop=segments[0][0])
+
+    workers = min(workers or os.cpu_count() or 1, len(ordered[0][1]))
+    if workers == 1:
+        results = _render_branch(prefix, params, ordered, segments, seed, flare_points)
+    else:
+        (key, values), rest = ordered[0], ordered[1:]
+        start, stop = segments[0]
+        start_tracker()
+        prefix_arr = np.asarray(prefix)
+        with SharedFrameSlots(1, prefix_arr.shape) as slots, \
+                process_pool(workers) as pool:
+            slots.array(0)[...] = prefix_arr
+            futures = []
+            for value in values:
+                # O primeiro eixo roda aqui também, cada ramo num worker
+                p = {**params, key: value}
+                branch_axes = [(key, [value])] + rest
+                futures.append(pool.submit(_render_branch_shared, slots.handle(0), p,
+                                           branch_axes, segments, seed, flare_points))
+            results = [(combo, Image.fromarray(arr))
+                       for future in futures for combo, arr in future.result()]
+
+    # Reordena para a ordem dos eixos pedida pelo chamador
+    by_combo = {tuple(sorted(combo.items())): out for combo, out in results}
+    ordered_results = []
+    for combo in _combinations(axes):
+        ordered_results.append((combo, by_combo[tuple(sorted(combo.items()))]))
+    return ordered_results
+
+
+def _combinations(axes):
+    if not axes:
+        return [{}]
+    key, values = axes[0]
+    return [{key: value, **rest} for value in values for rest in _combinations(axes[1:])]
+
+
+def contact_sheet(results, axes, cell_max=CELL_MAX_SIZE):
+    """Monta a grade rotulada: linhas = 1º eixo, colunas = 2º eixo"""
+    rows = len(axes[0][1])
+    cols = len(results) // rows
+
+    first = results[0][1]
+    scale = min(1.0, cell_max / max(first.size))
+    cell_w, cell_h = max(1, int(first.width * scale)), max(1, int(first.height * scale))
+
+    sheet = Image.new("RGB", (cols * cell_w, rows * (cell_h + LABEL_HEIGHT)), SHEET_BG)
+    draw = ImageDraw.Draw(sheet)
+    for i, (combo, img) in enumerate(results):
+        x = (i % cols) * cell_w
+        y = (i // cols) * (cell_h + LABEL_HEIGHT)
+        sheet.paste(img.resize((cell_w, cell_h), Image.Resampling.BILINEAR), (x, y + LABEL_HEIGHT))
+        label = " ".join(f"{key}={value}" for key, value in combo.items())
+        draw.text((x + 3, y + 2), label, fill=LABEL_COLOR)
+    return sheet
+
+
+def parse_axis(text):
+    """'fry_intensity=0,10,20' -> ('fry_intensity', [0, 10, 20])"""
+    key, sep, values = text.partition("=")
+    if not sep:
+        raise ValueError(f"expected param=v1,v2,..., got {text!r}")
+    if key not in SWEEP_PARAMS:
+        raise ValueError(f"cannot sweep {key}: choose one of {', '.join(SWEEP_PARAMS)}")
+    try:
+        values = [int(v) for v in values.split(",")]
+    except ValueError:
+        raise ValueError(f"{key} expects integers, got {values!r}") from None
+    for value in values:
+        check_range(key, value)
+    return key, values
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sweep de parâmetros em contact sheet")
+    parser.add_argument("image")
+    parser.add_argument("axes", nargs="+", help="param=v1,v2,... (1º eixo = linhas)")
+    parser.add_argument("-o", "--output", default="sweep.png")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--compare", action="store_true",
+                        help="também mede o custo de N chamadas independentes")
+    args = parser.parse_args()
+
+    try:
+        axes = [parse_axis(axis) for axis in args.axes]
+    except ValueError as e:
+        parser.error(str(e))
+
+    img = Image.open(args.image).convert("RGB")
+
+    start = time.perf_counter()
+    results = sweep(img, {}, axes, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    contact_sheet(results, axes).save(args.output)
+    print(f"{len(results)} variants in {elapsed:.2f}s -> {args.output}")
+
+    if args.compare:
+        start = time.perf_counter()
+        for combo, _ in results:
+            apply_all_effects(img, combo, seed=0)
+        print(f"independent calls: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Pipeline de frames para GIF/WebP animado e vídeo
+Decodifica, processa e codifica em streaming (memória constante)
+"""
+
+import os
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+from PIL import Image, ImageSequence
+
+from meme_effects import apply_all_effects
+from meme_shm import SharedFrameSlots, process_pool, render_shared, start_tracker
+
+ANIMATED_IMAGE_EXTS = ('.gif', '.webp')
+VIDEO_EXTS = ('.mp4', '.mov', '.avi', '.mkv', '.m4v', '.webm')
+
+# Codec FourCC por extensão de saída
+VIDEO_FOURCC = {
+    '.mp4': 'mp4v',
+    '.m4v': 'mp4v',
+    '.mov': 'mp4v',
+    '.avi': 'MJPG',
+    '.mkv': 'MJPG',
+}
+
+DEFAULT_FRAME_MS = 100
+
+
+def is_video(path):
+    return os.path.splitext(path)[1].lower() in VIDEO_EXTS
+
+
+def is_animated(path):
+    """True se o arquivo tem mais de um frame (GIF/WebP animado ou vídeo)"""
+    if is_video(path):
+        return True
+    if os.path.splitext(path)[1].lower() not in ANIMATED_IMAGE_EXTS:
+        return False
+    with Image.open(path) as im:
+        return getattr(im, "n_frames", 1) > 1
+
+
+def probe(path):
+    """Retorna (n_frames, duração do frame em ms) sem decodificar os frames"""
+    if is_video(path):
+        cap = cv2.VideoCapture(path)
+        try:
+            n_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            fps = cap.get(cv2.CAP_PROP_FPS) or 1000.0 / DEFAULT_FRAME_MS
+        finally:
+            cap.release()
+        return n_frames, 1000.0 / fps
+    with Image.open(path) as im:
+        return getattr(im, "n_frames", 1), im.info.get("duration", DEFAULT_FRAME_MS)
+
+
+def iter_frames(path):
+    """Gera (frame RGB, duração em ms) um por vez"""
+    if is_video(path):
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            raise IOError(f"cannot open video: {path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 1000.0 / DEFAULT_FRAME_MS
+        try:
+            while True:
+                ok, bgr = cap.read()
+                if not ok:
+                    break
+                yield Image.fromarray(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)), 1000.0 / fps
+        finally:
+            cap.release()
+        return
+
+    with Image.open(path) as im:
+        for frame in ImageSequence.Iterator(im):
+            duration = frame.info.get("duration", DEFAULT_FRAME_MS)
+            yield frame.convert("RGB"), duration
+
+
+def _render_frame(index, frame, params, seed):
+    """Worker: aplica a cadeia de efeitos em um frame (roda em outro processo)"""
+    img = Image.fromarray(frame)
+    return np.asarray(apply_all_effects(img, params, seed=seed, frame_index=index))
+
+
+def process_frames(frames, params, seed=0, workers=None, transport="shm"):
+    """
+    Processa frames em paralelo mantendo a ordem original.
+    No máximo 2 frames por worker ficam em voo, então a memória não cresce
+    com o tamanho do vídeo. Com transport="shm" os frames vão e voltam por
+    shared memory; "pickle" serializa cada frame pelo pipe do pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for index, (frame, duration) in enumerate(frames):
+            yield apply_all_effects(frame, params, seed=seed, frame_index=index), duration
+        return
+
+    window = workers * 2
+    pending = deque()
+    slots = None
+
+    def collect():
+        future, slot, duration = pending.popleft()
+        result = future.result()
+        if slot is None:
+            return Image.fromarray(result), duration
+        img = Image.fromarray(slots.array(slot).copy())
+        slots.release(slot)
+        return img, duration
+
+    if transport == "shm":
+        start_tracker()
+
+    try:
+        with process_pool(workers) as pool:
+            for index, (frame, duration) in enumerate(frames):
+                arr = np.asarray(frame)
+                if transport == "shm" and slots is None:
+                    slots = SharedFrameSlots(window, arr.shape)
+                if slots is not None and arr.shape == slots.shape:
+                    slot = slots.acquire()
+                    slots.array(slot)[...] = arr
+                    future = pool.submit(render_shared, slots.handle(slot), index, params, seed)
+                else:
+                    slot = None
+                    future = pool.submit(_render_frame, index, arr, params, seed)
+                pending.append((future, slot, duration))
+                if len(pending) >= window:
+                    yield collect()
+            while pending:
+                yield collect()
+    finally:
+        # Só depois do pool encerrado, para nenhum worker usar um bloco apagado
+        if slots is not None:
+            slots.close()
+
+
+def write_frames(frames, path):
+    """Codifica os frames processados; retorna quantos foram escritos"""
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext in VIDEO_FOURCC:
+        writer = None
+        count = 0
+        try:
+            for img, duration in frames:
+                if writer is None:
+                    fps = 1000.0 / max(duration, 1)
+                    fourcc = cv2.VideoWriter_fourcc(*VIDEO_FOURCC[ext])
+                    writer = cv2.VideoWriter(path, fourcc, fps, img.size)
+                    if not writer.isOpened():
+                        raise IOError(f"cannot open video writer: {path}")
+                rgb = np.asarray(img.convert("RGB"))
+                writer.write(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+                count += 1
+        finally:
+            if writer is not None:
+                writer.release()
+        return count
+
+    if ext in ANIMATED_IMAGE_EXTS:
+        # Pillow precisa de todos os frames para montar a animação, então eles
+        # ficam em memória; no GIF já convertidos para paleta (1 byte/pixel,
+        # a mesma conversão que o save faria no fim)
+        images, durations = [], []
+        for img, duration in frames:
+            if ext == '.gif':
+                img = img.convert("P", palette=Image.Palette.ADAPTIVE)
+            images.append(img)
+            durations.append(int(duration))
+        if not images:
+            return 0
+        fmt = 'GIF' if ext == '.gif' else 'WEBP'
+        images[0].save(path, fmt, save_all=True, append_images=images[1:],
+                       duration=durations, loop=0)
+        return len(images)
+
+    raise ValueError(f"unsupported animation format: {ext}")
+
+
+def render_animation(src_path, dst_path, params, seed=0, workers=None, transport="shm"):
+    """Decodifica, processa e codifica; retorna (frames, segundos, frames/s)"""
+    start = time.perf_counter()
+    frames = process_frames(iter_frames(src_path), params, seed=seed, workers=workers,
+                            transport=transport)
+    count = write_frames(frames, dst_path)
+    elapsed = time.perf_counter() - start
+    fps = count / elapsed if elapsed > 0 else 0.0
+    return count, elapsed, fps
@@ -0,0 +1,57 @@
+import numpy as np
+from PIL import Image
+
+import meme_corrupt
+import meme_effects
+import meme_sweep
+
+
+def _image():
+    return Image.effect_mandelbrot((128, 96), (-2, -1.5, 1, 1.5), 100).convert("RGB")
+
+
+def test_corrupt_reproducible():
+    img = _image()
+    params = {"quant_tamper": 6, "mcu_shuffle": 10, "datamosh": 4}
+    a = meme_effects.apply_all_effects(img, params, seed=3)
+    b = meme_effects.apply_all_effects(img, params, seed=3)
+    assert np.array_equal(np.asarray(a), np.asarray(b))
+    assert a.size == img.size
+
+
+def test_corrupt_neutral_is_noop():
+    img = _image()
+    assert meme_corrupt.corrupt(img) is img
+
+
+def test_sub_seeds_independent(monkeypatch):
+    """Cada operação recebe a mesma RNG estando as outras ligadas ou não"""
+    seen = {}
+
+    def spy(name, operation):
+        def wrapped(data, amount, rng):
+            seen.setdefault(name, []).append(rng.integers(0, 2 ** 32))
+            return operation(data, amount, rng)
+        return wrapped
+
+    for name in ("tamper_quant_tables", "shuffle_mcus", "flip_scan_bytes"):
+        monkeypatch.setattr(meme_corrupt, name, spy(name, getattr(meme_corrupt, name)))
+
+    img = _image()
+    meme_corrupt.corrupt(img, flip=0.5, rng=np.random.default_rng(7))
+    meme_corrupt.corrupt(img, 0.5, 0.5, 0.5, rng=np.random.default_rng(7))
+    assert seen["flip_scan_bytes"][0] == seen["flip_scan_bytes"][1]
+
+
+def test_corrupt_params_share_stage():
+    index = meme_effects.stage_index("corrupt")
+    for param in meme_effects.STAGE_PARAMS["corrupt"]:
+        assert meme_effects.stage_index(param) == index
+
+
+def test_sweep_matches_direct():
+    img = _image()
+    axes = [("datamosh", [0, 10]), ("quant_tamper", [0, 10])]
+    for combo, out in meme_sweep.sweep(img, {}, axes, seed=1, workers=1):
+        ref = meme_effects.apply_all_effects(img, combo, seed=1)
+        assert np.array_equal(np.asarray(out), np.asarray(ref))
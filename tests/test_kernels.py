@@ -0,0 +1,92 @@
+"""Paridade numérica entre os kernels NumPy e Numba de meme_kernels"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+import meme_kernels
+
+# Faixas dos sliders convertidas como em meme_effects (extremos + meio)
+VIBRANCE = [1.0, 1.5, 3.0]             # vibrance 10..30 / 10 (só ativo > 10)
+HIGHLIGHTS = [0.0, 1.0, 3.0]           # highlights 0..30 / 10
+SHADOWS = [0.0, 1.0, 3.0]              # shadows 0..30 / 10
+BLOOM = [0.05, 0.5, 1.0]               # bloom 1..20 / 20
+FRY = [0.1, 1.5, 3.0]                  # fry_intensity 1..30 / 10
+TOLERANCE = 1
+
+
+def _inputs(seed, size=(97, 131)):
+    """Imagem aleatória com faixas de pretos e brancos puros (bordas 0/255)"""
+    rng = np.random.default_rng(seed)
+    arr = rng.integers(0, 256, size=(*size, 3), dtype=np.uint8)
+    arr[:8] = 0
+    arr[8:16] = 255
+    arr[16:24, :, 0] = 255
+    arr[16:24, :, 1:] = 0
+    blur = rng.integers(0, 256, size=(*size, 3), dtype=np.uint8)
+    blur[:8] = 255
+    blur[8:16] = 0
+    return arr, blur
+
+
+def _assert_parity(name, *args):
+    expected = meme_kernels.get_kernel(name, "numpy")(*args)
+    actual = meme_kernels.get_kernel(name, "numba")(*args)
+    assert actual.dtype == np.uint8
+    assert actual.shape == expected.shape
+    diff = np.abs(expected.astype(np.int16) - actual.astype(np.int16)).max()
+    assert diff <= TOLERANCE, f"{name}{args[1:]}: differs by {diff} levels"
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("amount", VIBRANCE)
+def test_vibrance(seed, amount):
+    arr, _ = _inputs(seed)
+    _assert_parity("vibrance", arr, amount)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("amount", HIGHLIGHTS)
+def test_highlights(seed, amount):
+    arr, _ = _inputs(seed)
+    _assert_parity("highlights", arr, amount)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("amount", SHADOWS)
+def test_shadows(seed, amount):
+    arr, _ = _inputs(seed)
+    _assert_parity("shadows", arr, amount)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("amount", BLOOM)
+def test_bloom(seed, amount):
+    arr, blur = _inputs(seed)
+    _assert_parity("bloom", arr, blur, amount)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("intensity", FRY)
+def test_channel_gains(seed, intensity):
+    # Mesmos ganhos que meme_effects.deep_fry
+    arr, _ = _inputs(seed)
+    gains = (1 + intensity * 0.3, 1 + intensity * 0.15, 1 - intensity * 0.2)
+    _assert_parity("channel_gains", arr, *gains)
+
+
+@pytest.mark.parametrize("value", [0, 255])
+def test_constant_images(value):
+    arr = np.full((16, 16, 3), value, dtype=np.uint8)
+    _assert_parity("vibrance", arr, 3.0)
+    _assert_parity("highlights", arr, 3.0)
+    _assert_parity("shadows", arr, 3.0)
+    _assert_parity("bloom", arr, arr, 1.0)
+    _assert_parity("channel_gains", arr, 1.9, 1.45, 0.4)
+
+
+# check_parity respeita HDR_MEME_KERNELS=numpy; os testes acima não
+@pytest.mark.skipif(not meme_kernels.NUMBA_AVAILABLE, reason="HDR_MEME_KERNELS=numpy")
+def test_check_parity():
+    assert set(meme_kernels.check_parity()) == set(meme_kernels._KERNELS)
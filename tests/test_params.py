@@ -0,0 +1,67 @@
+import io
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import meme_effects
+import meme_filter
+import meme_params
+import meme_sweep
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("text", ["posterize=0", "jpeg_quality=-5", "pixelate=100000",
+                                  "noise", "foo=1", "noise=x"])
+def test_parse_param_rejects(text):
+    with pytest.raises(ValueError):
+        meme_filter.parse_param(text)
+
+
+def test_parse_param_limits():
+    for key, (lo, hi) in meme_params.SLIDER_RANGES.items():
+        assert meme_filter.parse_param(f"{key}={lo}") == (key, lo)
+        assert meme_filter.parse_param(f"{key}={hi}") == (key, hi)
+    assert meme_filter.parse_param("bulge=on") == ("bulge", True)
+
+
+def test_parse_axis():
+    assert meme_sweep.parse_axis("posterize=2,8,32") == ("posterize", [2, 8, 32])
+    for text in ("posterize=0,8", "posterize", "bulge=0,1", "noise=1,x", "hdr_gamma=0,20"):
+        with pytest.raises(ValueError):
+            meme_sweep.parse_axis(text)
+
+
+def test_ranges_cover_sliders():
+    assert set(meme_params.SLIDER_RANGES) == set(meme_params.DEFAULT_PARAMS) - set(meme_filter.BOOL_PARAMS)
+
+
+def _filter(img, *args):
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG")
+    proc = subprocess.run([sys.executable, os.path.join(ROOT, "meme_filter.py"), "--format", "png", *args],
+                          input=buffer.getvalue(), capture_output=True, timeout=60, check=True)
+    return np.asarray(Image.open(io.BytesIO(proc.stdout)))
+
+
+def test_filter_without_preset_is_neutral():
+    img = Image.effect_mandelbrot((64, 48), (-2, -1.5, 1, 1.5), 100).convert("RGB")
+    assert np.array_equal(_filter(img), np.asarray(img))
+    assert not np.array_equal(_filter(img, "--preset", "RESET"), np.asarray(img))
+
+
+def test_filter_import_keeps_backend():
+    """Importar meme_filter (ex. nos testes) não pode trocar o backend do processo"""
+    import meme_kernels
+    assert meme_kernels.BACKEND == ("numba" if meme_kernels.NUMBA_AVAILABLE else "numpy")
+
+
+def test_sweep_params_have_stages():
+    """SWEEP_PARAMS (sem NumPy) bate com os sliders que têm estágio na cadeia"""
+    assert meme_params.SWEEP_PARAMS == [
+        key for key in meme_params.SLIDER_RANGES if key in meme_effects.STAGE_INDEX
+    ]
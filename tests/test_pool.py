@@ -0,0 +1,39 @@
+"""O pool de frames não pode travar a saída depois de rodar kernels Numba"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("numba")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Como a GUI: o preview roda os kernels no processo pai antes do export
+SCRIPT = textwrap.dedent("""
+    import numpy as np
+    from PIL import Image
+
+    import meme_kernels
+    import meme_video
+
+    if __name__ == "__main__":
+        arr = np.random.default_rng(0).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+        meme_kernels.vibrance(arr, 2.0)
+        frames = [(Image.fromarray(arr), 100)] * 4
+        out = list(meme_video.process_frames(iter(frames), {"vibrance": 20}, seed=0, workers=2))
+        assert len(out) == 4
+        print("ok")
+""")
+
+
+def test_process_frames_exits_after_numba(tmp_path):
+    script = tmp_path / "export.py"
+    script.write_text(SCRIPT)
+    env = {**os.environ, "PYTHONPATH": ROOT, "HDR_MEME_KERNELS": "numba"}
+    result = subprocess.run([sys.executable, str(script)], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"